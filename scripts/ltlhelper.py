@@ -12,17 +12,30 @@ by default (../build/bin/LydiaSyftEL) and exposes convenience commands for:
 The synthesizers mapping contains functions that build the proper command string.
 """
 
+import functools
+import hashlib
 import os
+import re
 import shutil
 import subprocess
 import sys
 import time
+import types
 from pathlib import Path
 
-try:
-    from scipy import stats
-except Exception:
-    stats = None
+# Prefer the raw monotonic clock (not subject to NTP slew) for timing solver runs
+_CLK = time.CLOCK_MONOTONIC_RAW if hasattr(time, 'CLOCK_MONOTONIC_RAW') else time.CLOCK_MONOTONIC
+
+
+def _now_ms():
+    """Current reading of the monotonic clock in milliseconds."""
+    return time.clock_gettime_ns(_CLK) * 1e-6
+
+
+# Matches the realizability verdict printed by the solvers
+_STATUS_RE = re.compile(rb'(Unrealizable|Realizable)')
+# First number in a filename, used to sort inputs numerically
+_NUM_RE = re.compile(r'(\d+)')
 
 # locate project root and binary
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -36,8 +49,12 @@ if not os.path.exists(DEFAULT_BINARY):
         DEFAULT_BINARY = alt
 
 
+@functools.lru_cache(maxsize=8)
 def _ensure_binary(binary_path=None):
-    """Return a usable binary path or raise FileNotFoundError."""
+    """Return a usable binary path or raise FileNotFoundError.
+
+    The resolution is memoized so repeated command building does not re-stat the binary.
+    """
     if binary_path:
         if os.path.exists(binary_path) and os.access(binary_path, os.X_OK):
             return binary_path
@@ -99,7 +116,7 @@ def cmd_ltlfsynth(input_file, part_file, env_starts=False, binary=None, **kwargs
     return f"{binp} -f {input_file} -p {part_file}"
 
 
-synthesizers = {
+synthesizers = types.MappingProxyType({
     'EL': {
         'description': 'Emerson-Lei solver (Zielonka/EL)',
         'builder': cmd_el,
@@ -130,15 +147,19 @@ synthesizers = {
         'builder': lambda ip, p, env_starts, binary=None, **kw: cmd_mannapnueli(ip, p, env_starts, binary=binary, adv=True, **kw),
         'default_kwargs': {'adv': True}
     },
- }
+    # LTLf synthesizer (external tool like Syftmax)
+    'LTLf': {
+        'description': 'External LTLf synthesizer (Syftmax-like)',
+        'builder': cmd_ltlfsynth,
+        'default_kwargs': {}
+    },
+})
 
-# Add LTLf synthesizer (external tool like Syftmax)
-synthesizers['LTLf'] = {
-    'description': 'External LTLf synthesizer (Syftmax-like)',
-    'builder': cmd_ltlfsynth,
-    'default_kwargs': {}
-}
 
+@functools.lru_cache(maxsize=128)
+def _build_cmd_cached(synth_name, infile, part, env_starts, binary, kwargs_key):
+    """Build (and memoize) the command string for a synthesizer invocation."""
+    return synthesizers[synth_name]['builder'](infile, part, env_starts, binary=binary, **dict(kwargs_key))
 
 
 def run_synthesizer(synth_name, input_file, part_file=None, env_starts=False, binary=None, dry_run=False, **kwargs):
@@ -153,13 +174,13 @@ def run_synthesizer(synth_name, input_file, part_file=None, env_starts=False, bi
         dry_run: if True, print the command but do not execute
         kwargs: passed to builder (e.g., mode, obligation_simplification)
     """
-    if synth_name not in synthesizers:
+    entry = synthesizers.get(synth_name)
+    if entry is None:
         raise KeyError(f"Unknown synthesizer: {synth_name}")
 
     if part_file is None:
         part_file = os.path.splitext(input_file)[0] + '.part'
 
-    builder = synthesizers[synth_name]['builder']
     # If input_file supplied without extension, try to resolve based on synthesizer type
     base, ext = os.path.splitext(input_file)
     if ext == '':
@@ -172,9 +193,9 @@ def run_synthesizer(synth_name, input_file, part_file=None, env_starts=False, bi
     if part_file is None:
         part_file = os.path.splitext(input_file)[0] + '.part'
 
-    cmd = builder(input_file, part_file, env_starts, binary=binary, **kwargs)
+    cmd = _build_cmd_cached(synth_name, input_file, part_file, env_starts, binary, tuple(sorted(kwargs.items())))
 
-    print(f"Running {synth_name}: {synthesizers[synth_name]['description']}")
+    print(f"Running {synth_name}: {entry['description']}")
     print(f"Command: {cmd}")
 
     if dry_run:
@@ -189,61 +210,124 @@ def run_synthesizer(synth_name, input_file, part_file=None, env_starts=False, bi
         return -1
 
 
-def run_and_measure(cmd, runs=1):
+def _digest(*parts):
+    """Short SHA-256 fingerprint of a solver output given as one or more str/bytes parts."""
+    h = hashlib.sha256()
+    for s in parts:
+        h.update(s.encode() if isinstance(s, str) else s)
+    return h.hexdigest()[:16]
+
+
+def _output_tail(stdout, stderr, n=4096):
+    """Decode the last n bytes of stdout + b'\n' + stderr without joining the full buffers."""
+    k = n - len(stderr) - 1
+    if k < 0:
+        tail = stderr[-n:]
+    else:
+        tail = (stdout[-k:] if k else b'') + b'\n' + stderr
+    return tail.decode('utf-8', errors='replace')
+
+
+# Two-sided 95% Student-t quantiles keyed by sample size; scipy is only imported on first use
+_TVAL_CACHE = {}
+
+# Timed runs taken before --rel-tol may stop early, unless --min-runs says otherwise
+DEFAULT_MIN_RUNS = 3
+
+
+def _tval95(n):
+    """Return the 97.5% quantile of Student's t with n-1 degrees of freedom."""
+    tval = _TVAL_CACHE.get(n)
+    if tval is None:
+        try:
+            from scipy import stats
+        except Exception:
+            raise RuntimeError("scipy is required to compute 95% confidence intervals; please install scipy")
+        tval = _TVAL_CACHE[n] = float(stats.t.ppf(1.0 - 0.025, df=(n - 1)))
+    return tval
+
+
+def run_and_measure(cmd, runs=1, keep_outputs=True, min_runs=None, rel_tol=None):
     """Run command multiple times and return timings (ms) and stats.
 
     Returns dict: {'runs': [ms,...], 'mean':..., 'stddev':..., 'ci95': half-width}
+    The captured outputs are included under 'outputs' only if keep_outputs is set.
+
+    If rel_tol is given, `runs` is an upper bound: measuring stops early once at least
+    `min_runs` successful runs were taken and the 95% CI half-width is below
+    rel_tol * mean (min_runs defaults to DEFAULT_MIN_RUNS).
     """
     if runs <= 0:
         return {'runs': [], 'mean': 0.0, 'stddev': 0.0, 'ci95': 0.0, 'success_count': 0}
 
+    import math
+
+    if min_runs is None:
+        min_runs = DEFAULT_MIN_RUNS if rel_tol is not None else runs
+    min_runs = max(2, min_runs)
+
     timings = []
     success_count = 0
     errors = 0
     outputs = []
+    # running mean / sum of squared deviations (Welford's online algorithm)
+    mean = 0.0
+    m2 = 0.0
     for i in range(runs):
         # run but capture output (do not print solver output)
-        start = time.perf_counter()
+        start = _now_ms()
         try:
             res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            elapsed = (time.perf_counter() - start) * 1000.0
+            elapsed = _now_ms() - start
             out = (res.stdout or "") + "\n" + (res.stderr or "")
-            outputs.append(out)
+            if keep_outputs:
+                outputs.append(out)
             if res.returncode == 0:
                 timings.append(elapsed)
                 success_count += 1
+                delta = elapsed - mean
+                mean += delta / success_count
+                m2 += delta * (elapsed - mean)
             else:
                 errors += 1
         except Exception as e:
             errors += 1
-            outputs.append(str(e))
+            if keep_outputs:
+                outputs.append(str(e))
+
+        if rel_tol is not None and success_count >= min_runs and mean > 0:
+            sem = math.sqrt(m2 / (success_count - 1)) / math.sqrt(success_count)
+            ci95 = _tval95(success_count) * sem
+            if ci95 / mean < rel_tol:
+                break
 
     if success_count == 0:
-        return {'runs': timings, 'mean': 0.0, 'stddev': 0.0, 'ci95': 0.0, 'success_count': success_count, 'errors': errors, 'outputs': outputs}
+        result = {'runs': timings, 'mean': 0.0, 'stddev': 0.0, 'ci95': 0.0, 'success_count': success_count, 'errors': errors}
+        if keep_outputs:
+            result['outputs'] = outputs
+        return result
 
-    import math
-    mean = sum(timings) / len(timings)
     if len(timings) > 1:
         # sample stddev
-        variance = sum((x - mean) ** 2 for x in timings) / (len(timings) - 1)
+        variance = m2 / (len(timings) - 1)
         stddev = math.sqrt(variance)
-        if stats is None:
-            raise RuntimeError("scipy is required to compute 95% confidence intervals; please install scipy")
         sem = stddev / math.sqrt(len(timings))
-        tval = stats.t.ppf(1.0 - 0.025, df=(len(timings) - 1))
-        ci95 = tval * sem
+        ci95 = _tval95(len(timings)) * sem
     else:
         stddev = 0.0
         ci95 = 0.0
 
-    return {'runs': timings, 'mean': mean, 'stddev': stddev, 'ci95': ci95, 'success_count': success_count, 'errors': errors, 'outputs': outputs}
+    result = {'runs': timings, 'mean': mean, 'stddev': stddev, 'ci95': ci95, 'success_count': success_count, 'errors': errors}
+    if keep_outputs:
+        result['outputs'] = outputs
+    return result
 
 
 if __name__ == '__main__':
     import argparse
+    import fnmatch
     import glob
     import json
-    import re
 
     parser = argparse.ArgumentParser(description='Helper to run LydiaSyftEL or external LTLf synthesizers')
     parser.add_argument('synth', help='Synthesizer key (e.g. EL, Buchi-Classic, Buchi-Piterman, CoBuchi, LTLf, MannaPnueli)')
@@ -252,18 +336,26 @@ if __name__ == '__main__':
     parser.add_argument('--env-starts', action='store_true', help='Environment starts this game')
     parser.add_argument('--binary', help='Path to synthesizer binary (overrides detection)')
     parser.add_argument('-r', '--runs', type=int, default=1, help='Number of runs to average (default 1)')
+    parser.add_argument('--min-runs', type=int, default=None, help=f'Minimum number of timed runs before --rel-tol may stop early (default: {DEFAULT_MIN_RUNS})')
+    parser.add_argument('--max-runs', type=int, default=None, help='Maximum number of timed runs (overrides --runs)')
+    parser.add_argument('--rel-tol', type=float, default=None, help='Stop timing once ci95/mean drops below this value (e.g. 0.05)')
     parser.add_argument('--dry-run', action='store_true', help='Print command(s) but do not execute')
     parser.add_argument('--timeout', type=int, default=0, help='Per-run timeout seconds (0 = no timeout)')
     parser.add_argument('--json', dest='json_out', help='Write JSON summary to this file')
 
     args = parser.parse_args()
+    for opt, val in (('--min-runs', args.min_runs), ('--max-runs', args.max_runs)):
+        if val is not None and val < 1:
+            parser.error(f'{opt} must be at least 1')
 
     synth = args.synth
     input_arg = args.input
     part_arg = args.part
     env = args.env_starts
     binp = args.binary
-    runs = max(1, args.runs)
+    runs = max(1, args.max_runs if args.max_runs is not None else args.runs)
+    min_runs = args.min_runs
+    rel_tol = args.rel_tol
     dry = args.dry_run
     timeout_sec = args.timeout
     json_out = args.json_out
@@ -276,18 +368,40 @@ if __name__ == '__main__':
     inputs = []
     if any(ch in input_arg for ch in ['*', '?', '[']):
         # If no extension in pattern, try .ltlfplus (preferred) and .ltlf
-        base_name = os.path.basename(input_arg)
-        if '.' not in base_name:
-            pattern_plus = input_arg + '.ltlfplus'
-            pattern_ltf = input_arg + '.ltlf'
-            matches = glob.glob(pattern_plus)
-            if not matches:
-                matches = glob.glob(pattern_ltf)
+        dir_part, base_name = os.path.split(input_arg)
+        if any(ch in dir_part for ch in ['*', '?', '[']):
+            # glob in the directory part: let glob do the walking
+            if '.' not in base_name:
+                matches = glob.glob(input_arg + '.ltlfplus') or glob.glob(input_arg + '.ltlf')
+            else:
+                matches = glob.glob(input_arg)
         else:
-            matches = glob.glob(input_arg)
+            # single directory scan collecting both extension candidates at once
+            if '.' not in base_name:
+                rx_plus = re.compile(fnmatch.translate(base_name + '.ltlfplus'))
+                rx_ltf = re.compile(fnmatch.translate(base_name + '.ltlf'))
+            else:
+                rx_plus = re.compile(fnmatch.translate(base_name))
+                rx_ltf = None
+            matches_plus = []
+            matches_ltf = []
+            try:
+                with os.scandir(dir_part or '.') as it:
+                    for e in it:
+                        name = e.name
+                        if name.startswith('.') and not base_name.startswith('.'):
+                            continue
+                        if rx_plus.match(name):
+                            matches_plus.append(os.path.join(dir_part, name))
+                        elif rx_ltf is not None and rx_ltf.match(name):
+                            matches_ltf.append(os.path.join(dir_part, name))
+            except (FileNotFoundError, NotADirectoryError):
+                # missing directory: no matches, as with glob.glob
+                pass
+            matches = matches_plus or matches_ltf
         # sort numerically by first number found in filename
         def extract_num(p):
-            m = re.search(r'(\d+)', os.path.basename(p))
+            m = _NUM_RE.search(os.path.basename(p))
             return int(m.group(1)) if m else 0
         inputs = sorted(matches, key=extract_num)
     else:
@@ -311,30 +425,38 @@ if __name__ == '__main__':
 
         # run multiple times, capture outputs
         results = []
-        all_outputs = []
-        for rep in range(runs):
+        # fingerprints of every run's output, but the (4 KiB) tails of the first two only
+        output_hashes = []
+        output_tails = []
+        # with adaptive timing only the minimum number of runs is needed for status detection
+        status_runs = min(runs, min_runs or DEFAULT_MIN_RUNS) if rel_tol is not None else runs
+        for rep in range(status_runs):
             try:
                 if timeout_sec and timeout_sec > 0:
-                    proc = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout_sec)
+                    proc = subprocess.run(cmd, shell=True, capture_output=True, timeout=timeout_sec)
                 else:
-                    proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                    proc = subprocess.run(cmd, shell=True, capture_output=True)
                 elapsed = None
                 # We did not measure elapsed precisely here; use run_and_measure for timing
                 # But we still need realizability detection per run
-                out = (proc.stdout or '') + '\n' + (proc.stderr or '')
-                all_outputs.append(out)
-                # detect REALIZABLE / UNREALIZABLE (check UNREL first)
-                status = 'UNKNOWN'
-                if 'Unrealizable' in out:
+                # detect REALIZABLE / UNREALIZABLE with a single scan over the raw bytes
+                m = _STATUS_RE.search(proc.stdout) or _STATUS_RE.search(proc.stderr)
+                if m is None:
+                    status = 'UNKNOWN'
+                elif m.group(1) == b'Unrealizable':
                     status = 'UNREALIZABLE'
-                elif 'Realizable' in out:
+                else:
                     status = 'REALIZABLE'
-                results.append({'returncode': proc.returncode, 'status': status, 'output': out})
+                # hashed as raw bytes; only the tails that end up in the summary are decoded
+                output_hashes.append(_digest(proc.stdout, b'\n', proc.stderr))
+                if len(output_tails) < 2:
+                    output_tails.append(_output_tail(proc.stdout, proc.stderr))
+                results.append({'returncode': proc.returncode, 'status': status})
             except subprocess.TimeoutExpired as e:
-                results.append({'returncode': None, 'status': 'TIMEOUT', 'output': ''})
+                results.append({'returncode': None, 'status': 'TIMEOUT'})
 
         # For timing, call run_and_measure separately (it re-runs). The user requested timing and 95% CI using scipy.
-        timing_stats = run_and_measure(cmd, runs=runs)
+        timing_stats = run_and_measure(cmd, runs=runs, keep_outputs=False, min_runs=min_runs, rel_tol=rel_tol)
 
         # Consolidate status: if any run reported UNREALIZABLE -> UNREALIZABLE (user wanted check Unrel first), else if any REALIZABLE -> REALIZABLE
         statuses = [r['status'] for r in results]
@@ -349,7 +471,9 @@ if __name__ == '__main__':
             'status': final_status,
             'timing': timing_stats,
             'per_run_statuses': statuses,
-            'raw_outputs': timing_stats.get('outputs', all_outputs)[:5]  # keep first few outputs for debugging
+            # keep only the tails of the first outputs for debugging, plus fingerprints of all of them
+            'raw_outputs': output_tails,
+            'output_hashes': output_hashes,
         }
         summary.append(entry)
 
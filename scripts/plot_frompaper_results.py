@@ -4,8 +4,12 @@ Plot results from ∃-Pattern benchmark based on provided output.
 """
 
 import matplotlib.pyplot as plt
+import numpy as np
 import re
 
+# Pattern to match: Testing pattern_N... EL: Xms (status) MP: Xms (status) Oblig: Xms (status)
+_PARSE_RE = re.compile(r'Testing pattern_(\d+)\.\.\. EL: ([\d.]+)ms \(([^)]+)\) MP: ([\d.]+)ms \(([^)]+)\) Oblig: ([\d.]+)ms \(([^)]+)\)')
+
 # Parse the results
 results_text = """Testing pattern_1... EL: 3.1ms (ok) MP: 5.6ms (ok) Oblig: 4.0ms (ok)
 Testing pattern_2... EL: 3.0ms (ok) MP: 6.2ms (ok) Oblig: 4.3ms (ok)
@@ -28,65 +32,59 @@ Testing pattern_18... EL: 29682.0ms (ok) MP: 60000.0ms (timeout) Oblig: 17450.3m
 Testing pattern_19... EL: 60000.0ms (timeout) MP: 60000.0ms (timeout) Oblig: 17786.4ms (error)
 Testing pattern_20... EL: 60000.0ms (timeout) MP: 60000.0ms (timeout) Oblig: 19382.2ms (error)"""
 
+SOLVERS = ('el', 'mp', 'oblig')
+
+
 def parse_results(text):
-    """Parse the results text into structured data."""
+    """Parse the results text into structured data.
+
+    Returns one structure-of-arrays per solver: {'el': {'n': ..., 'status': ..., 'time': ...}, ...}
+    """
+    lines = text.strip().split('\n')
+    num_lines = len(lines)
     results = {
-        'el': [],
-        'mp': [],
-        'oblig': []
+        solver: {
+            'n': np.empty(num_lines, dtype=np.int32),
+            'status': np.empty(num_lines, dtype='U10'),
+            'time': np.empty(num_lines, dtype=np.float64),
+        }
+        for solver in SOLVERS
     }
     
     timeout_sec = 60
-    timeout_ms = timeout_sec * 1000
-    
-    # Pattern to match: Testing pattern_N... EL: Xms (status) MP: Xms (status) Oblig: Xms (status)
-    pattern = r'Testing pattern_(\d+)\.\.\. EL: ([\d.]+)ms \(([^)]+)\) MP: ([\d.]+)ms \(([^)]+)\) Oblig: ([\d.]+)ms \(([^)]+)\)'
     
-    for line in text.strip().split('\n'):
-        match = re.match(pattern, line)
+    i = 0
+    for line in lines:
+        match = _PARSE_RE.match(line)
         if match:
             n = int(match.group(1))
-            el_time = float(match.group(2))
-            el_status = match.group(3)
-            mp_time = float(match.group(4))
-            mp_status = match.group(5)
-            oblig_time = float(match.group(6))
-            oblig_status = match.group(7)
-            
-            results['el'].append((n, el_status, el_time))
-            results['mp'].append((n, mp_status, mp_time))
-            results['oblig'].append((n, oblig_status, oblig_time))
+            for k, solver in enumerate(SOLVERS):
+                results[solver]['n'][i] = n
+                results[solver]['time'][i] = float(match.group(2 + 2 * k))
+                results[solver]['status'][i] = match.group(3 + 2 * k)
+            i += 1
+    
+    # Drop the slots of lines that did not match
+    for solver in SOLVERS:
+        for key in ('n', 'status', 'time'):
+            results[solver][key] = results[solver][key][:i]
     
     return results, timeout_sec
 
 def plot_results(results, timeout_sec, output_file='frompaper_benchmark.png'):
     """Plot the benchmark results."""
     # Extract data
-    n_values = [r[0] for r in results['el']]
+    n_values = results['el']['n']
     timeout_ms = timeout_sec * 1000
     
     # For plotting, treat errors as timeouts (use timeout value instead of actual runtime)
-    el_times = []
-    mp_times = []
-    oblig_times = []
-    
-    for r in results['el']:
-        if r[1] in ['timeout', 'error']:
-            el_times.append(timeout_ms)
-        else:
-            el_times.append(r[2])
-    
-    for r in results['mp']:
-        if r[1] in ['timeout', 'error']:
-            mp_times.append(timeout_ms)
-        else:
-            mp_times.append(r[2])
-    
-    for r in results['oblig']:
-        if r[1] in ['timeout', 'error']:
-            oblig_times.append(timeout_ms)
-        else:
-            oblig_times.append(r[2])
+    times = {}
+    for solver in SOLVERS:
+        failed = np.isin(results[solver]['status'], ['timeout', 'error'])
+        times[solver] = np.where(failed, timeout_ms, results[solver]['time'])
+    el_times = times['el']
+    mp_times = times['mp']
+    oblig_times = times['oblig']
     
     # Create figure
     plt.figure(figsize=(12, 8))
@@ -101,23 +99,13 @@ def plot_results(results, timeout_sec, output_file='frompaper_benchmark.png'):
     
     # Mark timeouts and errors (plot above timeout line)
     timeout_offset = timeout_ms * 1.1  # 10% above timeout line
-    for i, (n, status, runtime) in enumerate(results['el']):
-        if status == 'timeout':
-            plt.plot(n, timeout_offset, 'ro', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
-        elif status == 'error':
-            plt.plot(n, timeout_offset, 'rx', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
-    
-    for i, (n, status, runtime) in enumerate(results['mp']):
-        if status == 'timeout':
-            plt.plot(n, timeout_offset, 'rs', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
-        elif status == 'error':
-            plt.plot(n, timeout_offset, 'rx', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
-    
-    for i, (n, status, runtime) in enumerate(results['oblig']):
-        if status == 'timeout':
-            plt.plot(n, timeout_offset, 'r^', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
-        elif status == 'error':
-            plt.plot(n, timeout_offset, 'rx', markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
+    for solver, timeout_marker in (('el', 'ro'), ('mp', 'rs'), ('oblig', 'r^')):
+        status = results[solver]['status']
+        n = results[solver]['n']
+        for mask, marker in ((status == 'timeout', timeout_marker), (status == 'error', 'rx')):
+            if mask.any():
+                plt.plot(n[mask], np.full(np.count_nonzero(mask), timeout_offset), marker, linestyle='none',
+                         markersize=12, markeredgewidth=2, markeredgecolor='black', zorder=10)
     
     plt.xlabel('Pattern Size (n)', fontsize=14)
     plt.ylabel('Runtime (ms)', fontsize=14)
@@ -127,7 +115,7 @@ def plot_results(results, timeout_sec, output_file='frompaper_benchmark.png'):
     plt.yscale('log')  # Use log scale for better visualization
     
     # Set y-axis to show timeout clearly
-    max_time = max(max(el_times), max(mp_times), max(oblig_times))
+    max_time = max(el_times.max(), mp_times.max(), oblig_times.max())
     plt.ylim(bottom=1, top=max(max_time * 1.5, timeout_ms * 1.5))
     
     plt.tight_layout()
@@ -142,13 +130,14 @@ def main():
     print("=" * 60)
     
     for solver_name, solver_results in [('EL', results['el']), ('MP', results['mp']), ('Obligation', results['oblig'])]:
-        timeouts = sum(1 for _, status, _ in solver_results if status == 'timeout')
-        errors = sum(1 for _, status, _ in solver_results if status == 'error')
-        ok = sum(1 for _, status, _ in solver_results if status == 'ok')
+        status = solver_results['status']
+        timeouts = np.count_nonzero(status == 'timeout')
+        errors = np.count_nonzero(status == 'error')
+        ok_mask = status == 'ok'
+        ok = np.count_nonzero(ok_mask)
         
-        ok_times = [r[2] for r in solver_results if r[1] == 'ok']
-        if ok_times:
-            avg_time = sum(ok_times) / len(ok_times)
+        if ok:
+            avg_time = solver_results['time'][ok_mask].mean()
         else:
             avg_time = 0
         
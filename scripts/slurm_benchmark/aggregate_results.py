@@ -9,14 +9,20 @@ from pathlib import Path
 import os
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def aggregate(results_dir, out_file):
     p = Path(results_dir)
-    files = list(p.glob('*.json'))
+    files = list(p.rglob('*.json'))
     data = {}
     for f in files:
         try:
-            j = json.loads(f.read_text())
+            raw = f.read_bytes()
+            j = orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception:
             continue
         key = os.path.basename(j.get('pattern_file') or f.name)
@@ -26,7 +32,10 @@ def aggregate(results_dir, out_file):
     for k, runs in data.items():
         out['patterns'][k] = runs
 
-    Path(out_file).write_text(json.dumps(out, indent=2))
+    if orjson is not None:
+        Path(out_file).write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    else:
+        Path(out_file).write_text(json.dumps(out, indent=2))
     print(f'Wrote aggregated results: {out_file} ({len(files)} run files)')
 
 
@@ -3,30 +3,197 @@
 Run a single benchmark run (intended to be invoked by a Slurm job).
 
 This script executes the target binary (optionally inside a Singularity image),
-enforces a timeout, measures elapsed time and peak memory (RSS) using resource
-usage, captures stdout/stderr, and writes a JSON result file to the given
+enforces a timeout, measures elapsed time and peak memory (RSS) from the child's
+own rusage (wait4), falling back to sampling /proc/<pid>/status, captures
+stdout/stderr, and writes a JSON result file to the given
 output directory.
 
 It is designed to be robust inside Slurm jobs and to produce one JSON file per
 run (no shared locking required).
 """
 import argparse
+import fcntl
 import json
 import os
 import shlex
 import subprocess
 import sys
 import time
-import resource
 import socket
 import signal
 import tempfile
+import threading
+from collections import deque
 from pathlib import Path
 import shutil
 import traceback
 import sys
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the raw monotonic clock (not subject to NTP slew) for elapsed times
+_CLK = time.CLOCK_MONOTONIC_RAW if hasattr(time, 'CLOCK_MONOTONIC_RAW') else time.CLOCK_MONOTONIC
+
+
+def _now_s():
+    """Current reading of the monotonic clock in seconds."""
+    return time.clock_gettime_ns(_CLK) * 1e-9
+
+
+# Result files are transient telemetry and os.replace already makes them appear
+# atomically, so only pay for fsync when explicitly requested.
+DURABLE = os.environ.get('JOB_RUNNER_FSYNC') == '1'
+
+
+# The host does not change during the process; look it up once at import
+_HOSTNAME = socket.gethostname()
+
+
+# Only the last MAX_LOG bytes of the child's stdout/stderr are kept in the report
+MAX_LOG = 200_000
+
+
+def _encode(obj, line=False):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE if line else orjson.OPT_INDENT_2)
+    if line:
+        return (json.dumps(obj, separators=(',', ':')) + '\n').encode('utf-8')
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _dumps(obj, line=False):
+    """Serialize `obj` to indented JSON bytes, or to one compact newline-terminated line.
+
+    Uses orjson if available, stdlib json otherwise. Reports normally hold only
+    plain JSON types, so they are encoded directly; sanitize() only runs when the
+    encoder rejects something (bytes, paths, non-str keys, ...).
+    """
+    try:
+        return _encode(obj, line)
+    except TypeError:
+        return _encode(sanitize(obj), line)
+
+
+def _append_line(path, data):
+    """Append the record `data` to the shared file `path` while holding an exclusive flock.
+
+    O_APPEND alone only keeps writes up to PIPE_BUF from interleaving; reports with
+    captured output are larger than that, so concurrent runs take the lock.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        view = memoryview(data)
+        while view:
+            n = os.write(fd, view)
+            view = view[n:]
+        if DURABLE:
+            os.fsync(fd)
+    finally:
+        # closing the descriptor also releases the lock
+        os.close(fd)
+
+
+def _write_bytes(path, data):
+    """Write `data` to `path` with a single write syscall (looping only on short writes).
+
+    The file is fsync'ed only if DURABLE is set (JOB_RUNNER_FSYNC=1).
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            n = os.write(fd, view)
+            view = view[n:]
+        if DURABLE:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Leaf types that are already JSON-serializable as-is
+_PASSTHROUGH = frozenset((str, int, float, bool, type(None)))
+
+
+def sanitize(obj: Any):
+    """Return a JSON-serializable copy of `obj`.
+
+    Bytes are decoded, dicts/lists/tuples are copied (with str keys), and any
+    other object falls back to str(). Containers are walked with an explicit
+    work stack instead of recursion.
+    """
+    root = [None]
+    stack = deque([(root, 0, obj)])
+    while stack:
+        parent, key, o = stack.pop()
+        if type(o) in _PASSTHROUGH:
+            parent[key] = o
+        elif isinstance(o, bytes):
+            parent[key] = o.decode('utf-8', errors='backslashreplace')
+        elif isinstance(o, (str, int, float)):
+            parent[key] = o
+        elif isinstance(o, dict):
+            # pre-insert keys so the copy keeps the original key order
+            new = dict.fromkeys(str(k) for k in o)
+            parent[key] = new
+            stack.extend((new, str(k), v) for k, v in o.items())
+        elif isinstance(o, (list, tuple)):
+            new = [None] * len(o)
+            parent[key] = new
+            stack.extend((new, i, v) for i, v in enumerate(o))
+        else:
+            # Path-like objects or other objects -> convert to str
+            try:
+                parent[key] = str(o)
+            except Exception:
+                parent[key] = repr(o)
+    return root[0]
+
+
+def _read_tail(f, limit=MAX_LOG):
+    """Decode the last `limit` bytes of binary file `f`; return (text, truncated)."""
+    size = f.seek(0, os.SEEK_END)
+    f.seek(max(0, size - limit))
+    return f.read().decode('utf-8', errors='backslashreplace'), size > limit
+
+
+def _read_vmhwm_kb(pid):
+    """Return the peak RSS (VmHWM, kB) of a live process from /proc, or 0 if unavailable."""
+    try:
+        with open(f'/proc/{pid}/status', 'rb') as f:
+            for line in f:
+                if line.startswith(b'VmHWM:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+class _PeakRssSampler(threading.Thread):
+    """Poll /proc/<pid>/status of a running child and keep the largest VmHWM seen."""
+
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while True:
+            self.peak_kb = max(self.peak_kb, _read_vmhwm_kb(self.pid))
+            if self._done.wait(self.interval):
+                return
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return self.peak_kb
+
 
 def run_once(binary, binary_args, singularity, formula_file, partition_file, timeout_s, extra_env=None):
     # Build command list
@@ -52,39 +219,72 @@ def run_once(binary, binary_args, singularity, formula_file, partition_file, tim
     if extra_env:
         env.update(extra_env)
 
-    start = time.monotonic()
-    try:
-        # Run and capture output; enforce timeout
-        proc = subprocess.run(
+    # posix_spawn (instead of fork+exec) needs an executable path with a directory
+    # component, close_fds=False and no pipes; capture output via temp files instead.
+    if not os.path.dirname(cmd[0]):
+        cmd[0] = shutil.which(cmd[0], path=env.get('PATH')) or cmd[0]
+
+    # The kernel carries the spawning process's peak RSS over the exec into the
+    # child's ru_maxrss, so wait4's figure is only the child's own above this
+    spawn_hwm_kb = _read_vmhwm_kb('self')
+
+    with tempfile.TemporaryFile() as sout_file, tempfile.TemporaryFile() as serr_file:
+        start = _now_s()
+        proc = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=timeout_s,
+            stdin=subprocess.DEVNULL,
+            stdout=sout_file,
+            stderr=serr_file,
             env=env,
-            text=True
+            close_fds=False
         )
-        elapsed = time.monotonic() - start
-        returncode = proc.returncode
-        stdout = proc.stdout
-        stderr = proc.stderr
+        sampler = _PeakRssSampler(proc.pid)
+        sampler.start()
+
+        # Enforce the timeout with an interval timer: Popen.wait(timeout=...) polls
+        # waitpid with growing sleeps, which delays noticing the child's exit.
         timed_out = False
-    except subprocess.TimeoutExpired as e:
-        elapsed = time.monotonic() - start
-        # subprocess.TimeoutExpired does not capture partial output reliably for complex children; mark timeout
-        returncode = None
-        stdout = getattr(e, 'output', '') or ''
-        stderr = getattr(e, 'stderr', '') or ''
-        timed_out = True
-
-    # Get resource usage for child processes
-    try:
-        r = resource.getrusage(resource.RUSAGE_CHILDREN)
-        # ru_maxrss is in kilobytes on Linux
-        max_rss_kb = getattr(r, 'ru_maxrss', 0)
-    except Exception:
-        max_rss_kb = 0
+        reaped = False
+
+        def on_alarm(signum, frame):
+            nonlocal timed_out
+            if not reaped:
+                timed_out = True
+                # os.kill, not proc.kill(): Popen.send_signal() polls first and
+                # could reap the child before wait4 below gets its rusage
+                try:
+                    os.kill(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+        prev_alarm = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout_s)
+        try:
+            # wait4 reaps the child and returns its own rusage; RUSAGE_CHILDREN
+            # would be the maximum over every child this process ever reaped
+            _, status, child_rusage = os.wait4(proc.pid, 0)
+            reaped = True
+            returncode = proc.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, prev_alarm)
+        elapsed = _now_s() - start
+        if timed_out:
+            # the child was killed; whatever it wrote so far is still in the temp files
+            returncode = None
+        sampled_rss_kb = sampler.stop()
+
+        # Only the tail of very large outputs is read back, to keep memory and JSON sane
+        stdout, stdout_truncated = _read_tail(sout_file)
+        stderr, stderr_truncated = _read_tail(serr_file)
 
-    return {
+    # Peak memory of this child (kilobytes on Linux): its own ru_maxrss from wait4
+    # when it exceeds what it inherited at spawn, else the /proc VmHWM samples,
+    # else unknown
+    child_rss_kb = child_rusage.ru_maxrss if child_rusage.ru_maxrss > spawn_hwm_kb else 0
+    max_rss_kb = child_rss_kb or sampled_rss_kb or None
+
+    result = {
         'cmd': cmd,
         'returncode': returncode,
         'timeout': timed_out,
@@ -93,72 +293,55 @@ def run_once(binary, binary_args, singularity, formula_file, partition_file, tim
         'stdout': stdout,
         'stderr': stderr,
     }
+    if stdout_truncated:
+        result['stdout_truncated'] = True
+    if stderr_truncated:
+        result['stderr_truncated'] = True
+    return result
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Run a single benchmark job (for Slurm array)')
-    parser.add_argument('--binary', required=True, help='Path to LydiaSyftEL binary inside container or host')
-    parser.add_argument('--binary-args', default='', help='Extra arguments to pass to the binary (quoted)')
-    parser.add_argument('--singularity', default='', help='Path to singularity image (optional)')
-    parser.add_argument('--mode', default=None, help='Solver mode (el, cl, pm, wg, cb)')
-    parser.add_argument('--formula', required=True, help='Path to .ltlfplus file')
-    parser.add_argument('--partition', required=True, help='Path to .part file')
-    parser.add_argument('--run-idx', type=int, required=True, help='Run index (1..N)')
-    parser.add_argument('--out-dir', required=True, help='Directory where per-run JSON result will be written')
-    parser.add_argument('--timeout', type=int, default=60, help='Timeout in seconds for this run')
-
-    args = parser.parse_args()
-
-    os.makedirs(args.out_dir, exist_ok=True)
+def run_job(binary, binary_args, singularity, mode, formula, partition, run_idx, out_dir, timeout):
+    """Run the binary once, write its report and return the exit status for the run."""
+    os.makedirs(out_dir, exist_ok=True)
 
     # Determine pattern name and construct output filename early so a signal handler can write it
-    base = os.path.splitext(os.path.basename(args.formula))[0]
-    sjid = os.environ.get('SLURM_JOB_ID') or 'local'
-    sat = os.environ.get('SLURM_ARRAY_TASK_ID') or str(args.run_idx)
-    mode_tag = (args.mode or os.environ.get('MODE')) or 'nomode'
-    out_fname = f"{base}.{mode_tag}.job{sjid}_task{sat}.run{args.run_idx}.json"
-    out_file = os.path.join(args.out_dir, out_fname)
+    base = os.path.splitext(os.path.basename(formula))[0]
+    # Environment is read once here (not at import) so in-process callers can vary it
+    env = os.environ
+    slurm_job_id = env.get('SLURM_JOB_ID')
+    slurm_task_id = env.get('SLURM_ARRAY_TASK_ID')
+    sjid = slurm_job_id or 'local'
+    sat = slurm_task_id or str(run_idx)
+    mode_tag = (mode or env.get('MODE')) or 'nomode'
+    out_fname = f"{base}.{mode_tag}.job{sjid}_task{sat}.run{run_idx}.json"
+    out_file = os.path.join(out_dir, out_fname)
+    started_marker = out_file + '.started'
+    # With JOB_RUNNER_NDJSON=<path> the report is appended as one line to that shared
+    # file instead of being written to its own JSON file (mode_table.py reads both).
+    ndjson_path = env.get('JOB_RUNNER_NDJSON')
 
     # Build metadata early so signal handler can write a partial report
     metadata = {
-        'pattern_file': args.formula,
-        'partition_file': args.partition,
-        'run_idx': args.run_idx,
+        'pattern_file': formula,
+        'partition_file': partition,
+        'run_idx': run_idx,
         'mode': mode_tag,
-        'hostname': socket.gethostname(),
-        'slurm_job_id': os.environ.get('SLURM_JOB_ID'),
-        'slurm_array_task_id': os.environ.get('SLURM_ARRAY_TASK_ID'),
+        'hostname': _HOSTNAME,
+        'slurm_job_id': slurm_job_id,
+        'slurm_array_task_id': slurm_task_id,
         'timestamp': time.time(),
     }
 
-    START_TIME = time.monotonic()
+    START_TIME = _now_s()
 
     def write_atomic(report_obj, path):
-        def sanitize(o: Any):
-            # Convert bytes to str, recursively sanitize containers, and
-            # fall back to str() for other non-serializable objects.
-            if isinstance(o, bytes):
-                return o.decode('utf-8', errors='backslashreplace')
-            if isinstance(o, str) or o is None or isinstance(o, (int, float, bool)):
-                return o
-            if isinstance(o, dict):
-                return {str(k): sanitize(v) for k, v in o.items()}
-            if isinstance(o, (list, tuple)):
-                return [sanitize(v) for v in o]
-            # Path-like objects or other objects -> convert to str
-            try:
-                return str(o)
-            except Exception:
-                return repr(o)
-
         Path(path).parent.mkdir(parents=True, exist_ok=True)
         tmp = str(path) + '.tmp'
         try:
+            # serialize once, in memory; every write path below reuses the same bytes
+            data = _dumps(report_obj)
             print(f"[job_runner] writing tmp file: {tmp}", file=sys.stderr, flush=True)
-            with open(tmp, 'w') as f:
-                json.dump(sanitize(report_obj), f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
+            _write_bytes(tmp, data)
             print(f"[job_runner] tmp written, attempting atomic replace -> {path}", file=sys.stderr, flush=True)
             try:
                 os.replace(tmp, path)
@@ -181,10 +364,7 @@ def main():
             # As a last resort, write the file directly and remove the tmp file.
             try:
                 print(f"[job_runner] writing final file directly: {path}", file=sys.stderr, flush=True)
-                with open(path, 'w') as f:
-                    json.dump(sanitize(report_obj), f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
+                _write_bytes(path, data)
                 # remove tmp if it still exists
                 if os.path.exists(tmp):
                     try:
@@ -204,25 +384,76 @@ def main():
             print(traceback.format_exc(), file=sys.stderr, flush=True)
             return
 
-    def sigterm_handler(signum, frame):
-        # Called when Slurm sends SIGTERM; write a partial report indicating termination
-        elapsed = time.monotonic() - START_TIME
+    def emit(report_obj):
+        if not ndjson_path:
+            write_atomic(report_obj, out_file)
+            return
+        try:
+            _append_line(ndjson_path, _dumps(report_obj, line=True))
+        except Exception as e:
+            print(f"[job_runner] appending to {ndjson_path} failed: {e!r}", file=sys.stderr, flush=True)
+            print(traceback.format_exc(), file=sys.stderr, flush=True)
+
+    # Pre-render the partial report for each handled signal (minus the closing brace),
+    # so on termination only the elapsed time is spliced in before a plain write.
+    partial_head = {}
+    for sig in (signal.SIGTERM, signal.SIGINT):
         partial = {
             **metadata,
             'cmd': None,
             'returncode': None,
             'timeout': True,
-            'killed_by_signal': int(signum),
-            'elapsed_s': elapsed,
+            'killed_by_signal': int(sig),
             'max_rss_kb': None,
             'stdout': '',
-            'stderr': f'Terminated by signal {signum} before run completion.'
+            'stderr': f'Terminated by signal {int(sig)} before run completion.'
         }
+        partial_head[int(sig)] = _dumps(partial, line=bool(ndjson_path)).rstrip()[:-1].rstrip()
+
+    # Open the '.started' sidecar (a single inode op, no JSON encode) so that a run
+    # killed hard (SIGKILL) before the final report is written still leaves a
+    # trace. On SIGTERM/SIGINT the partial report is written into it and it is
+    # renamed over the result file; otherwise it is removed after the full report.
+    try:
+        marker_fd = os.open(started_marker, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    except OSError:
+        # best-effort; continue even if we can't write the marker
+        marker_fd = None
+    # The handler must not re-enter _append_line: emit() may hold the flock on its own
+    # descriptor when the signal arrives. It appends the short partial line with one
+    # O_APPEND write on this descriptor, opened up front, instead.
+    ndjson_fd = None
+    if ndjson_path:
         try:
-            write_atomic(partial, out_file)
-            print(f'Wrote partial result due to signal {signum}: {out_file}')
-        except Exception:
+            ndjson_fd = os.open(ndjson_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        except OSError:
             pass
+    partial_msg = {sig: f'Wrote partial result due to signal {sig}: {ndjson_path or out_file}\n'.encode()
+                   for sig in partial_head}
+    report_done = False
+
+    def sigterm_handler(signum, frame):
+        # Called when Slurm sends SIGTERM; write a partial report indicating termination
+        if not report_done:
+            elapsed = repr(_now_s() - START_TIME).encode()
+            try:
+                if ndjson_path:
+                    if ndjson_fd is not None:
+                        os.write(ndjson_fd, partial_head[signum] + b',"elapsed_s":' + elapsed + b'}\n')
+                    if marker_fd is not None:
+                        os.remove(started_marker)
+                else:
+                    data = partial_head[signum] + b',\n  "elapsed_s": ' + elapsed + b'\n}'
+                    if marker_fd is not None:
+                        view = memoryview(data)
+                        while view:
+                            view = view[os.write(marker_fd, view):]
+                        os.replace(started_marker, out_file)
+                    else:
+                        _write_bytes(out_file, data)
+                os.write(1, partial_msg[signum])
+            except Exception:
+                pass
         # exit with code indicating signal
         os._exit(128 + int(signum))
 
@@ -230,42 +461,97 @@ def main():
     signal.signal(signal.SIGTERM, sigterm_handler)
     signal.signal(signal.SIGINT, sigterm_handler)
 
-    # Write an initial 'started' JSON so that if the process is killed hard
-    # (SIGKILL) before the final report is written, there is still a valid
-    # JSON file present describing the run start. This is intentionally small
-    # and will be replaced by the full report at the end of the run.
-    try:
-        started = {**metadata, 'status': 'started', 'partial': True}
-        write_atomic(started, out_file)
-    except Exception:
-        # best-effort; continue even if we can't write the started file
-        pass
-
     # Run
-    result = run_once(args.binary, args.binary_args, args.singularity or None, args.formula, args.partition, args.timeout)
+    result = run_once(binary, binary_args, singularity or None, formula, partition, timeout)
 
     # Augment result with metadata
     report = {**metadata, **result}
 
-    # Truncate very large outputs to keep JSON sane
-    MAX_LOG = 200_000
-    if len(report.get('stdout') or '') > MAX_LOG:
-        report['stdout_truncated'] = True
-        report['stdout'] = (report.get('stdout') or '')[:MAX_LOG]
-    if len(report.get('stderr') or '') > MAX_LOG:
-        report['stderr_truncated'] = True
-        report['stderr'] = (report.get('stderr') or '')[:MAX_LOG]
-
-    # Write atomically
-    write_atomic(report, out_file)
+    # Write atomically (or append to the shared NDJSON file). The signals are held
+    # back until the '.started' marker is gone, so the handler can neither interrupt
+    # emit() nor move the marker over a finished result file.
+    old_mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM, signal.SIGINT})
+    try:
+        emit(report)
+        report_done = True
+        if ndjson_fd is not None:
+            os.close(ndjson_fd)
+        if marker_fd is not None:
+            os.close(marker_fd)
+            try:
+                os.remove(started_marker)
+            except OSError:
+                pass
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, old_mask)
 
-    print(f"Wrote result: {out_file}")
+    print(f"Wrote result: {ndjson_path or out_file}")
     # Exit status: 0 if run completed (even if binary returned non-zero), 2 if timed out
     if result['timeout']:
-        sys.exit(2)
-    else:
-        # Return the child's returncode if available, otherwise 1
-        sys.exit(result['returncode'] if result['returncode'] is not None else 1)
+        return 2
+    # Return the child's returncode if available, otherwise 1
+    return result['returncode'] if result['returncode'] is not None else 1
+
+
+def serve(args):
+    """Run newline-delimited JSON tasks from stdin, one after another, in this process.
+
+    Each task holds formula, partition, mode, run_idx and optionally binary_args
+    (put before --binary-args) and out_dir (default --out-dir). Like the bash loop
+    this replaces, a failing run skips the remaining runs of its mode, for this and
+    all later patterns. Returns the exit status of the last run.
+    """
+    failed = {}  # mode -> formula it failed on
+    skipped = set()
+    status = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        task = json.loads(line)
+        formula, mode, run_idx = task['formula'], task['mode'], task['run_idx']
+        if mode in failed:
+            if failed[mode] == formula:
+                print(f"Skipping formula={formula}, mode={mode}, run={run_idx} (previous run failed)", flush=True)
+            elif (formula, mode) not in skipped:
+                skipped.add((formula, mode))
+                print(f"Skipping formula={formula}, mode={mode} (mode failed on earlier pattern)", flush=True)
+            continue
+        print(f"Running formula={formula}, mode={mode}, run={run_idx}, host={_HOSTNAME}", flush=True)
+        binary_args = ' '.join(a for a in (task.get('binary_args'), args.binary_args) if a)
+        status = run_job(args.binary, binary_args, args.singularity, mode, formula, task['partition'],
+                         run_idx, task.get('out_dir') or args.out_dir, args.timeout)
+        sys.stdout.flush()
+        if status != 0:
+            print(f"Run failed with exit code {status}, skipping remaining runs and this mode for all future patterns", flush=True)
+            failed[mode] = formula
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a single benchmark job (for Slurm array)')
+    parser.add_argument('--binary', required=True, help='Path to LydiaSyftEL binary inside container or host')
+    parser.add_argument('--binary-args', default='', help='Extra arguments to pass to the binary (quoted)')
+    parser.add_argument('--singularity', default='', help='Path to singularity image (optional)')
+    parser.add_argument('--mode', default=None, help='Solver mode (el, cl, pm, wg, cb)')
+    parser.add_argument('--formula', help='Path to .ltlfplus file')
+    parser.add_argument('--partition', help='Path to .part file')
+    parser.add_argument('--run-idx', type=int, help='Run index (1..N)')
+    parser.add_argument('--out-dir', required=True, help='Directory where per-run JSON result will be written')
+    parser.add_argument('--timeout', type=int, default=60, help='Timeout in seconds for this run')
+    parser.add_argument('--server', action='store_true',
+                        help='Read one JSON task per line from stdin and run them in this process (see serve())')
+
+    args = parser.parse_args()
+
+    # setitimer treats 0 as "disarm" and rejects negative values, so neither can mean a limit
+    if args.timeout <= 0:
+        parser.error('--timeout must be a positive number of seconds')
+    if args.server:
+        sys.exit(serve(args))
+    if args.formula is None or args.partition is None or args.run_idx is None:
+        parser.error('--formula, --partition and --run-idx are required without --server')
+    sys.exit(run_job(args.binary, args.binary_args, args.singularity, args.mode, args.formula, args.partition,
+                     args.run_idx, args.out_dir, args.timeout))
 
 
 if __name__ == '__main__':
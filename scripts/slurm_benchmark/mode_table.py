@@ -18,17 +18,36 @@ Usage:
 from __future__ import annotations
 import argparse
 import csv
+import hashlib
 import json
+import mmap
 import os
 import re
-from collections import defaultdict
-from functools import lru_cache
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any
 import math
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 PATTERN_NUM_RE = re.compile(r"pattern[_\-](\d+)", re.IGNORECASE)
-ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+WALL_TIME_RE = re.compile(r"Wall time:\s*([0-9]+\.?[0-9]*)\s*seconds")
+CPU_TIME_RE = re.compile(r"CPU time:\s*([0-9]+\.?[0-9]*)\s*seconds")
+
+# One parsed run; `wall`/`cpu` are the times reported on the solver's stdout (or None)
+RunRec = namedtuple("RunRec", "elapsed timeout rc sig wall cpu file")
+# Aggregates of one (pattern, mode) cell: elapsed mean/count/std and whether any run
+# timed out, failed (non-zero return code) or segfaulted
+CellStats = namedtuple("CellStats", "mean count std timeout failed sig")
 
 # ANSI color helpers
 class Colors:
@@ -40,20 +59,94 @@ class Colors:
     RESET = '\033[0m'
     @staticmethod
     def wrap(s: str, color: str, use_color: bool):
-        return f"{color}{s}{Colors.RESET}" if use_color else s
-
-def strip_ansi(s: str) -> str:
-    return ANSI_RE.sub('', s)
+        return f"{color}{s}{Colors.RESET}" if use_color and color else s
+
+class Cell(str):
+    """Table cell text that remembers its printable width (i.e. without ANSI codes)."""
+    def __new__(cls, text: str, width: int):
+        obj = super().__new__(cls, text)
+        obj.width = width
+        return obj
+
+def make_cell(parts: List[Tuple[str, str]], use_color: bool) -> str:
+    # parts are (text, color) pairs joined by single spaces
+    if not use_color:
+        # no escape codes: a plain str is its own printable width, skip wrapping entirely
+        return " ".join([t for t, _ in parts])
+    text = " ".join([Colors.wrap(t, color, True) for t, color in parts])
+    return Cell(text, sum(len(t) for t, _ in parts) + len(parts) - 1)
+
+def visible_len(s: str) -> int:
+    return s.width if isinstance(s, Cell) else len(s)
+
+def _scan_pattern_number(s: str) -> str | None:
+    # Same result as PATTERN_NUM_RE.search(s).group(1), with plain str.find instead
+    # of the regex engine; the regex stays as fallback if lower() changes the length.
+    low = s.lower()
+    if len(low) != len(s):
+        m = PATTERN_NUM_RE.search(s)
+        return m.group(1) if m else None
+    n = len(s)
+    i = low.find("pattern")
+    while i >= 0:
+        j = i + 7
+        if j < n and s[j] in "_-":
+            k = j + 1
+            while k < n and s[k].isdecimal():
+                k += 1
+            if k > j + 1:
+                return s[j + 1:k]
+        i = low.find("pattern", i + 1)
+    return None
 
 def find_pattern_number(data: dict, filename: str) -> str:
-    pf = data.get("pattern_file") or ""
-    m = PATTERN_NUM_RE.search(pf)
-    if m:
-        return m.group(1)
-    m2 = PATTERN_NUM_RE.search(filename)
-    if m2:
-        return m2.group(1)
-    return "UNK"
+    pf = data.get("pattern_file")
+    if pf:
+        num = _scan_pattern_number(pf)
+        if num:
+            return num
+    return _scan_pattern_number(filename) or "UNK"
+
+# Files at least this large are parsed from an mmap (with orjson) instead of a read() copy
+MMAP_MIN_BYTES = 4096
+
+def _read_fd(fd: int, size: int) -> bytes:
+    chunks = []
+    while True:
+        # ask for one byte more than the size: a short read means EOF, so
+        # a regular file is read with a single read() call
+        want = max(size, 4096) + 1
+        chunk = os.read(fd, want)
+        chunks.append(chunk)
+        if len(chunk) < want:
+            break
+    return b"".join(chunks)
+
+def read_bytes(path: str) -> bytes:
+    # Minimal syscall sequence (open, fstat, read, close): skips the isatty/lseek
+    # probes and buffer setup that the io module does on open().
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return _read_fd(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_json(path: str) -> Any:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if orjson is not None and size >= MMAP_MIN_BYTES:
+            # parse straight out of the page cache, without copying into a bytes object
+            with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mm, memoryview(mm) as mv:
+                return orjson.loads(mv)
+        return loads(_read_fd(fd, size))
+    finally:
+        os.close(fd)
 
 def looks_like_sigsegv(returncode: Any, stdout: str, stderr: str) -> bool:
     if isinstance(returncode, int) and returncode in (-11, 139):
@@ -61,86 +154,266 @@ def looks_like_sigsegv(returncode: Any, stdout: str, stderr: str) -> bool:
     txt = ((stderr or "") + "\n" + (stdout or "")).lower()
     return ("segmentation fault" in txt) or ("segfault" in txt)
 
-def collect(dirpath: str, recursive: bool=False) -> Tuple[Dict[Tuple[str,str], List[Dict[str,Any]]], List[Tuple[str,str]]]:
-    files = []
-    if recursive:
-        for root, _, fnames in os.walk(dirpath):
-            for f in fnames:
-                if f.lower().endswith(".json"):
-                    files.append(os.path.join(root, f))
-    else:
-        for f in sorted(os.listdir(dirpath)):
-            if f.lower().endswith(".json"):
-                files.append(os.path.join(dirpath, f))
+# Below this many files the process pool startup costs more than it saves
+PARALLEL_MIN_FILES = 256
 
-    bucket = defaultdict(list)
-    parse_errors = []
+def _parse_one(p: str) -> List[Tuple[bool, Any, Any]]:
+    """Parse one result file into a list of (True, (pattern, mode), run) or (False, path, error)."""
+    if p.lower().endswith(".ndjson"):
+        return _parse_ndjson(p)
+    try:
+        data = load_json(p)
+    except Exception as e:
+        return [(False, p, str(e))]
+    return [_parse_record(data, p)]
 
-    for p in files:
+def _parse_ndjson(p: str) -> List[Tuple[bool, Any, Any]]:
+    # one report per line, as appended by job_runner.py with JOB_RUNNER_NDJSON set
+    try:
+        data = read_bytes(p)
+    except Exception as e:
+        return [(False, p, str(e))]
+    out = []
+    for lineno, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
         try:
-            with open(p, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            rec = loads(line)
         except Exception as e:
-            parse_errors.append((p, str(e)))
+            out.append((False, f"{p}:{lineno}", str(e)))
             continue
+        out.append(_parse_record(rec, p))
+    return out
+
+def _stdout_time(regex: re.Pattern, txt: str) -> float | None:
+    m = regex.search(txt)
+    if m:
+        try:
+            return float(m.group(1))
+        except Exception:
+            return None
+    return None
+
+def _parse_record(data: dict, p: str) -> Tuple[bool, Any, Any]:
+    fname = os.path.basename(p)
+    pattern_num = find_pattern_number(data, fname)
+    mode = data.get("mode") or "MISSING"
+    elapsed = data.get("elapsed_s")
+    elapsed_v = None
+    if isinstance(elapsed, (int, float)):
+        elapsed_v = float(elapsed)
+
+    timeout = bool(data.get("timeout", False))
+    rc = data.get("returncode")
+    # try to normalize ints from strings
+    if isinstance(rc, str) and rc.isdigit():
+        rc = int(rc)
+    stdout = data.get("stdout", "") or ""
+    stderr = data.get("stderr", "") or ""
+    sig = looks_like_sigsegv(rc, stdout, stderr)
+    # parse the reported times now, so stdout never has to be kept or reread
+    wall = _stdout_time(WALL_TIME_RE, stdout)
+    cpu = _stdout_time(CPU_TIME_RE, stdout)
+
+    return True, (pattern_num, mode), RunRec(elapsed_v, timeout, rc, sig, wall, cpu, p)
+
+# With --cache, parsed results are kept in a JSON file under the user's cache
+# directory (never in the scanned, often shared, results directory), one file per
+# scanned directory, keyed by (path, mtime_ns, size) so reruns on an unchanged
+# directory skip all JSON parsing.
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "lydia")
+# Bump when the cached record layout changes
+_CACHE_TAG = [2, list(RunRec._fields)]
+
+def cache_file(dirpath: str, recursive: bool) -> str:
+    ident = f"{os.path.abspath(dirpath)}|recursive={recursive}"
+    digest = hashlib.blake2b(ident.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"mode_table-{digest}.json")
+
+def _load_cache(path: str) -> dict:
+    """Return {(path, mtime_ns, size): results} from a cache file, or {}."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable cache {path}: {e}", file=sys.stderr)
+        return {}
+    if not isinstance(data, dict) or data.get("tag") != _CACHE_TAG:
+        return {}  # written by another version; rebuilt below
+    entries = {}
+    try:
+        for fpath, mtime_ns, size, results in data["entries"]:
+            entries[(fpath, mtime_ns, size)] = [
+                (ok, tuple(key) if ok else key, RunRec(*value) if ok else value)
+                for ok, key, value in results
+            ]
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Warning: ignoring malformed cache {path}: {e}", file=sys.stderr)
+        return {}
+    return entries
+
+def _store_cache(path: str, entries: dict) -> None:
+    data = {
+        "tag": _CACHE_TAG,
+        "entries": [[fpath, mtime_ns, size, results] for (fpath, mtime_ns, size), results in entries.items()],
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not write cache {path}: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def collect(dirpath: str, recursive: bool=False, use_cache: bool=False) -> Tuple[Dict[Tuple[str,str], List[RunRec]], List[Tuple[str,str]]]:
+    # DirEntry caches the file type from the directory read, so no extra stat()s are
+    # needed (except for the cache key). Order does not matter: runs are grouped into
+    # `bucket` below.
+    files = []
+    keys = []
+    pending = [dirpath]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for e in it:
+                if e.is_file():
+                    if e.name.lower().endswith((".json", ".ndjson")):
+                        files.append(e.path)
+                        if use_cache:
+                            st = e.stat()
+                            keys.append((e.path, st.st_mtime_ns, st.st_size))
+                elif recursive and e.is_dir(follow_symlinks=False):
+                    pending.append(e.path)
+
+    bucket = defaultdict(list)
+    parse_errors = []
+
+    cache_path = cache_file(dirpath, recursive)
+    cached = _load_cache(cache_path) if use_cache else {}
+    todo = [p for p, k in zip(files, keys) if k not in cached] if use_cache else files
+
+    if len(todo) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor() as ex:
+            fresh = list(ex.map(_parse_one, todo, chunksize=64))
+    else:
+        fresh = list(map(_parse_one, todo))
+
+    if use_cache:
+        fresh_by_path = dict(zip(todo, fresh))
+        entries = {}
+        parsed = []
+        for p, k in zip(files, keys):
+            if p in fresh_by_path:
+                entries[k] = fresh_by_path[p]
+            else:
+                entries[k] = cached[k]
+            parsed.append(entries[k])
+        if todo or len(entries) != len(cached):
+            _store_cache(cache_path, entries)
+    else:
+        parsed = fresh
 
-        fname = os.path.basename(p)
-        pattern_num = find_pattern_number(data, fname)
-        mode = data.get("mode") or "MISSING"
-        elapsed = data.get("elapsed_s")
-        elapsed_v = None
-        if isinstance(elapsed, (int, float)):
-            elapsed_v = float(elapsed)
-
-        timeout = bool(data.get("timeout", False))
-        rc = data.get("returncode")
-        # try to normalize ints from strings
-        if isinstance(rc, str) and rc.isdigit():
-            rc = int(rc)
-        stdout = data.get("stdout", "") or ""
-        stderr = data.get("stderr", "") or ""
-        sig = looks_like_sigsegv(rc, stdout, stderr)
-
-        bucket[(pattern_num, mode)].append({
-            "elapsed": elapsed_v,
-            "timeout": timeout,
-            "rc": rc,
-            "sig": sig,
-            "file": p
-        })
+    for results in parsed:
+        for ok, key, value in results:
+            if ok:
+                bucket[key].append(value)
+            else:
+                parse_errors.append((key, value))
     return bucket, parse_errors
 
 
-@lru_cache(maxsize=4096)
-def _load_stdout_from_json(path: str) -> str:
-    try:
-        with open(path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
-        return data.get("stdout", "") or ""
-    except Exception:
-        return ""
+def run_failed(rc: Any) -> bool:
+    """True if a run's return code is present and non-zero (digit strings count as ints)."""
+    if isinstance(rc, str) and rc.isdigit():
+        rc = int(rc)
+    return rc is not None and rc != 0
+
+
+def cell_stats(bucket: Dict[Tuple[str,str], List[RunRec]], patterns: List[str], modes: List[str]) -> Dict[Tuple[str,str], CellStats] | None:
+    """CellStats for every (pattern, mode) in the bucket.
+
+    Runs are packed into patterns x modes x repetitions cubes (NaN / False padded) so
+    the reductions happen in numpy instead of per-cell Python loops. The std is the
+    population std. Returns None when numpy is not available; callers then fall back
+    to aggregating per cell.
+    """
+    if np is None or not bucket:
+        return None
+    pidx = {p: i for i, p in enumerate(patterns)}
+    midx = {m: i for i, m in enumerate(modes)}
+    reps = max(len(runs) for runs in bucket.values())
+    shape = (len(patterns), len(modes), reps)
+    cube = np.full(shape, np.nan)
+    timeout = np.zeros(shape, dtype=bool)
+    failed = np.zeros(shape, dtype=bool)
+    sig = np.zeros(shape, dtype=bool)
+    for (pat, mode), runs in bucket.items():
+        i, j, n = pidx[pat], midx[mode], len(runs)
+        cube[i, j, :n] = [np.nan if r.elapsed is None else r.elapsed for r in runs]
+        timeout[i, j, :n] = [r.timeout for r in runs]
+        failed[i, j, :n] = [run_failed(r.rc) for r in runs]
+        sig[i, j, :n] = [r.sig for r in runs]
+
+    present = ~np.isnan(cube)
+    count = present.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present, cube, 0.0).sum(axis=2) / count
+        dev = np.where(present, cube - mean[..., None], 0.0)
+        std = np.sqrt((dev * dev).sum(axis=2) / count)
+    timeout_any = timeout.any(axis=2)
+    failed_any = failed.any(axis=2)
+    sig_any = sig.any(axis=2)
+
+    out = {}
+    for (pat, mode) in bucket:
+        ij = pidx[pat], midx[mode]
+        out[(pat, mode)] = CellStats(float(mean[ij]), int(count[ij]), float(std[ij]),
+                                     bool(timeout_any[ij]), bool(failed_any[ij]), bool(sig_any[ij]))
+    return out
+
+
+def mean_std(values) -> Tuple[float, int, float]:
+    """Mean, count and population std of the non-None `values`, in one pass (Welford)."""
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        if x is None:
+            continue
+        n += 1
+        d = x - mean
+        mean += d / n
+        m2 += d * (x - mean)
+    return mean, n, math.sqrt(m2 / n) if n else 0.0
 
-def build_cell(runs: List[Dict[str,Any]], use_color: bool) -> str:
+
+def build_cell(runs: List[RunRec], use_color: bool) -> str:
     # Deprecated signature kept for backward-compat; delegate to new signature
     return build_cell_with_time(runs, use_color, time_source="elapsed")
 
 
-def build_cell_with_time(runs: List[Dict[str,Any]], use_color: bool, time_source: str) -> str:
-    # collect return codes (non-None)
+def build_cell_with_time(runs: List[RunRec], use_color: bool, time_source: str, stats: CellStats | None = None) -> str:
+    # one pass: return codes (non-None), segfaults, timeouts
     rc_set = set()
+    sig_any = False
+    timeout_any = False
     for r in runs:
-        if r["rc"] is None:
+        sig_any = sig_any or r.sig
+        timeout_any = timeout_any or r.timeout
+        if r.rc is None:
             continue
         try:
             # coerce possible floats that are ints
-            rc_val = int(r["rc"])
-            rc_set.add(rc_val)
+            rc_set.add(int(r.rc))
         except Exception:
             # non-int codes (unlikely) keep raw
-            rc_set.add(r["rc"])
-    # detect segfaults
-    sig_any = any(r["sig"] for r in runs)
-    timeout_any = any(r["timeout"] for r in runs)
+            rc_set.add(r.rc)
 
     # If any non-zero return code present (and not None and not zero) -> SUPPRESS time
     nonzero_codes = sorted([c for c in rc_set if isinstance(c, int) and c != 0] +
@@ -156,41 +429,43 @@ def build_cell_with_time(runs: List[Dict[str,Any]], use_color: bool, time_source
             # if c corresponds to segv codes (-11,139) we may have added SIGSEGV already, still include numeric if asked
             code_labels.append(str(c))
         label = ",".join(code_labels)
-        cell = f"X({label})"
-        cell = Colors.wrap(cell, Colors.RED, use_color)
+        parts = [(f"X({label})", Colors.RED)]
         # if also timeouts present, append small yellow 'x'
         if timeout_any:
-            cell += " " + Colors.wrap("x", Colors.YELLOW, use_color)
-        return cell
+            parts.append(("x", Colors.YELLOW))
+        return make_cell(parts, use_color)
 
     # else all rc == 0 or missing
 
-    elapsed_vals: List[float] = []
-    for r in runs:
-        val = _extract_time(r, time_source)
-        if val is not None:
-            elapsed_vals.append(val)
+    if stats is not None and time_source == "elapsed":
+        avg, n_timed = stats.mean, stats.count
+    else:
+        elapsed_vals: List[float] = []
+        for r in runs:
+            val = _extract_time(r, time_source)
+            if val is not None:
+                elapsed_vals.append(val)
+        n_timed = len(elapsed_vals)
+        avg = sum(elapsed_vals) / n_timed if n_timed else 0.0
     cell_parts = []
-    if elapsed_vals:
-        avg = sum(elapsed_vals) / len(elapsed_vals)
-        if len(elapsed_vals) != len(runs):
+    if n_timed:
+        if n_timed != len(runs):
             # some runs didn't report elapsed: show count as n_with_time/total
-            time_str = f"{avg:.3f}s ({len(elapsed_vals)}/{len(runs)})"
+            time_str = f"{avg:.3f}s ({n_timed}/{len(runs)})"
         else:
             time_str = f"{avg:.3f}s" + (f" ({len(runs)})" if len(runs) > 1 else "")
-        time_str = Colors.wrap(time_str, Colors.GREEN, use_color)
-        cell_parts.append(time_str)
+        cell_parts.append((time_str, Colors.GREEN))
     else:
-        cell_parts.append("-")
+        cell_parts.append(("-", ""))
 
     # append timeout mark if any
     if timeout_any:
-        cell_parts.append(Colors.wrap("x", Colors.YELLOW, use_color))
+        cell_parts.append(("x", Colors.YELLOW))
     # append SIGSEGV uppercase mark if any (even if returncodes are zero but evidence present)
     if sig_any:
-        cell_parts.append(Colors.wrap("X", Colors.RED, use_color))
+        cell_parts.append(("X", Colors.RED))
 
-    return " ".join(cell_parts)
+    return make_cell(cell_parts, use_color)
 
 
 LATEX_MODE_ORDER = ["wg", "el", "pm", "cl", "sr", "cb", "ltlf"]
@@ -204,45 +479,35 @@ LATEX_MODE_NAMES = {
 }
 
 
-def format_latex_cell(runs: List[Dict[str, Any]], show_ci: bool, time_source: str = "elapsed") -> str:
+def format_latex_cell(runs: List[RunRec], show_ci: bool, time_source: str = "elapsed", stats: CellStats | None = None) -> str:
     # Error / OOM / non-zero return -> ddagger, but any timeout wins with dagger
-    rc_set = set()
-    for r in runs:
-        rc = r["rc"]
-        if isinstance(rc, str) and rc.isdigit():
-            rc = int(rc)
-        if rc is not None:
-            rc_set.add(rc)
-
-    timeout_any = any(r["timeout"] for r in runs)
-
+    if stats is not None:
+        timeout_any, failed_any = stats.timeout, stats.failed
+    else:
+        timeout_any = any(r.timeout for r in runs)
+        failed_any = any(run_failed(r.rc) for r in runs)
     if timeout_any:
         return r"\textsc{$\dagger$}"
-
-    nonzero_codes = [c for c in rc_set if isinstance(c, int) and c != 0] + [c for c in rc_set if not isinstance(c, int) and c not in (None, 0)]
-    if nonzero_codes:
+    if failed_any:
         return r"\textsc{$\ddagger$}"
 
-    elapsed_vals: List[float] = []
-    for r in runs:
-        val = _extract_time(r, time_source)
-        if val is not None:
-            elapsed_vals.append(val)
-    if not elapsed_vals:
-        return r"\textsc{$\dagger$}"
+    if stats is not None and time_source == "elapsed":
+        avg, n_timed, std = stats.mean, stats.count, stats.std
+        if not n_timed:
+            return r"\textsc{$\dagger$}"
+    else:
+        avg, n_timed, std = mean_std(_extract_time(r, time_source) for r in runs)
+        if not n_timed:
+            return r"\textsc{$\dagger$}"
 
-    avg = sum(elapsed_vals) / len(elapsed_vals)
     cell = f"\\textbf{{{avg:.3f}s}}"
-    if show_ci and len(elapsed_vals) > 1:
-        mean = avg
-        var = sum((x - mean) ** 2 for x in elapsed_vals) / len(elapsed_vals)
-        std = math.sqrt(var)
+    if show_ci and n_timed > 1:
         cell += f" \\scriptsize $\\pm${std:.3f}s"
 
     return cell
 
 
-def make_table_latex(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_errors: List[Tuple[str, str]], show_ci: bool, time_source: str = "elapsed"):
+def make_table_latex(bucket: Dict[Tuple[str, str], List[RunRec]], parse_errors: List[Tuple[str, str]], show_ci: bool, time_source: str = "elapsed"):
     pattern_nums = set()
     modes = set()
     for (pat, mode) in bucket.keys():
@@ -271,6 +536,7 @@ def make_table_latex(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_
     ordered_modes.extend(unknown_modes)
 
     col_headers = [LATEX_MODE_NAMES.get(m, m) for m in ordered_modes]
+    stats = cell_stats(bucket, sorted_patterns, ordered_modes)
 
     # Begin LaTeX table
     cols_spec = "r|" + "c" * len(ordered_modes)
@@ -284,7 +550,8 @@ def make_table_latex(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_
         cells = [pat]
         for mode in ordered_modes:
             runs = bucket.get((pat, mode), [])
-            cell = format_latex_cell(runs, show_ci=show_ci, time_source=time_source) if runs else r"\textsc{$\dagger$}"
+            cell = format_latex_cell(runs, show_ci=show_ci, time_source=time_source,
+                                     stats=stats[(pat, mode)] if stats else None) if runs else r"\textsc{$\dagger$}"
             cells.append(cell)
         print(" ".join([str(cells[0])]) + " & " + " & ".join(cells[1:]) + r" \\")
 
@@ -296,7 +563,7 @@ def make_table_latex(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_
         for p, err in parse_errors:
             print(f"% - {p}: {err}")
 
-def make_table(bucket: Dict[Tuple[str,str], List[Dict[str,Any]]], parse_errors: List[Tuple[str,str]], use_color: bool, time_source: str = "elapsed"):
+def make_table(bucket: Dict[Tuple[str,str], List[RunRec]], parse_errors: List[Tuple[str,str]], use_color: bool, time_source: str = "elapsed"):
     pattern_nums = set()
     modes = set()
     for (pat, mode) in bucket.keys():
@@ -320,6 +587,7 @@ def make_table(bucket: Dict[Tuple[str,str], List[Dict[str,Any]]], parse_errors:
     sorted_modes = sorted(modes)
 
     header = ["number"] + sorted_modes
+    stats = cell_stats(bucket, sorted_patterns, sorted_modes)
     # prepare rows
     rows = []
     for pat in sorted_patterns:
@@ -329,14 +597,15 @@ def make_table(bucket: Dict[Tuple[str,str], List[Dict[str,Any]]], parse_errors:
             if not runs:
                 cell = "-"
             else:
-                cell = build_cell_with_time(runs, use_color, time_source=time_source)
+                cell = build_cell_with_time(runs, use_color, time_source=time_source,
+                                            stats=stats[(pat, mode)] if stats else None)
             row.append(cell)
         rows.append(row)
 
-    # compute col widths considering ANSI codes (use strip_ansi)
+    # compute col widths from the visible (ANSI-free) length of each cell
     col_widths = []
     for cidx in range(len(header)):
-        maxw = max(len(strip_ansi(header[cidx])), max((len(strip_ansi(row[cidx])) for row in rows), default=0))
+        maxw = max((visible_len(row[cidx]) for row in rows), default=0)
         col_widths.append(max(maxw, len(header[cidx])))
 
     # print header
@@ -345,7 +614,7 @@ def make_table(bucket: Dict[Tuple[str,str], List[Dict[str,Any]]], parse_errors:
     print(hdr_line)
     print(sep_line)
     for r in rows:
-        line = " | ".join(r[i].ljust(col_widths[i] + (len(r[i]) - len(strip_ansi(r[i])))) for i in range(len(r)))
+        line = " | ".join(r[i].ljust(col_widths[i] + (len(r[i]) - visible_len(r[i]))) for i in range(len(r)))
         print(line)
 
     if parse_errors:
@@ -354,29 +623,15 @@ def make_table(bucket: Dict[Tuple[str,str], List[Dict[str,Any]]], parse_errors:
             print(f"# - {p}: {err}")
 
 
-def _extract_time(run: Dict[str, Any], time_source: str) -> float | None:
-    if time_source in ("wall", "cpu") and not run.get("timeout", False):
-        txt = ""
-        path = run.get("file")
-        if isinstance(path, str):
-            txt = _load_stdout_from_json(path)
-        if not txt:
-            txt = run.get("stdout", "") or ""
-        wall_m = re.search(r"Wall time:\s*([0-9]+\.?[0-9]*)\s*seconds", txt)
-        cpu_m = re.search(r"CPU time:\s*([0-9]+\.?[0-9]*)\s*seconds", txt)
-        match = wall_m if time_source == "wall" else cpu_m
-        if match:
-            try:
-                return float(match.group(1))
-            except Exception:
-                return None
-    val = run.get("elapsed")
-    if isinstance(val, (int, float)):
-        return float(val)
-    return None
+def _extract_time(run: RunRec, time_source: str) -> float | None:
+    if time_source in ("wall", "cpu") and not run.timeout:
+        val = run.wall if time_source == "wall" else run.cpu
+        if val is not None:
+            return val
+    return run.elapsed
 
 
-def make_table_csv(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_errors: List[Tuple[str, str]], time_source: str = "elapsed"):
+def make_table_csv(bucket: Dict[Tuple[str, str], List[RunRec]], parse_errors: List[Tuple[str, str]], time_source: str = "elapsed"):
     pattern_nums = set()
     modes = set()
     for (pat, mode) in bucket.keys():
@@ -404,6 +659,7 @@ def make_table_csv(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_er
     ordered_modes.extend(unknown_modes)
 
     headers = ["size"] + [LATEX_MODE_NAMES.get(m, m) for m in ordered_modes]
+    stats = cell_stats(bucket, sorted_patterns, ordered_modes)
     writer = csv.writer(sys.stdout)
     writer.writerow(headers)
 
@@ -415,27 +671,25 @@ def make_table_csv(bucket: Dict[Tuple[str, str], List[Dict[str, Any]]], parse_er
                 row.append(0)
                 continue
 
-            timeout_any = any(r.get("timeout", False) for r in runs)
-            sig_any = any(r.get("sig", False) for r in runs)
-            rc_set = set()
-            for r in runs:
-                rc = r.get("rc")
-                if isinstance(rc, str) and rc.isdigit():
-                    rc = int(rc)
-                if rc is not None:
-                    rc_set.add(rc)
-            nonzero_codes = [c for c in rc_set if isinstance(c, int) and c != 0] + [c for c in rc_set if not isinstance(c, int) and c not in (None, 0)]
-
-            if timeout_any or sig_any or nonzero_codes:
+            st = stats[(pat, mode)] if stats else None
+            if st is not None:
+                bad = st.timeout or st.sig or st.failed
+            else:
+                bad = any(r.timeout or r.sig or run_failed(r.rc) for r in runs)
+            if bad:
                 row.append(0)
                 continue
 
-            times = [_extract_time(r, time_source) for r in runs]
-            times = [t for t in times if t is not None]
-            if not times:
+            if st is not None and time_source == "elapsed":
+                avg, n_timed = st.mean, st.count
+            else:
+                times = [_extract_time(r, time_source) for r in runs]
+                times = [t for t in times if t is not None]
+                n_timed = len(times)
+                avg = sum(times) / n_timed if n_timed else 0.0
+            if not n_timed:
                 row.append(0)
             else:
-                avg = sum(times) / len(times)
                 row.append(f"{avg:.3f}")
 
         writer.writerow(row)
@@ -454,9 +708,11 @@ def main():
     ap.add_argument("--time-source", choices=["elapsed", "wall", "cpu"], default="elapsed",
                     help="Which time to use when reporting runtimes: 'elapsed' from JSON (default), or parse 'Wall/CPU' from stdout when available")
     ap.add_argument("--csv", action="store_true", help="Output CSV with runtimes (timeouts/segfaults reported as 0)")
+    ap.add_argument("--cache", action="store_true",
+                    help=f"Reuse parsed results of unchanged files across runs (stored as JSON under {CACHE_DIR})")
     args = ap.parse_args()
 
-    bucket, parse_errors = collect(args.dir, recursive=args.recursive)
+    bucket, parse_errors = collect(args.dir, recursive=args.recursive, use_cache=args.cache)
     if args.csv:
         make_table_csv(bucket, parse_errors, time_source=args.time_source)
     elif args.latex:
@@ -14,169 +14,408 @@ Notes:
  - This approach avoids concurrent writes to the same file: each run produces its own JSON
 """
 import argparse
+import functools
+import io
 import os
+import random
+import re
 import subprocess
 import sys
 import time
 import json
 import shutil
+import tempfile
+import threading
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
 
 TEMPLATE = Path(__file__).parent / 'job_slurm.sh.template'
+# Body of the template (everything after its shebang), read once and appended to every job script
+TEMPLATE_BODY = '\n'.join(TEMPLATE.read_text().splitlines()[1:])
+
+# --single-node: run the template body once per run index, with early exit: skip
+# the remaining runs once one fails
+SINGLE_NODE_LOOP_HEAD = """\
+skip_remaining=0
+for RUN_IDX in $(seq 1 %d); do
+  if [ "$skip_remaining" -eq 1 ]; then
+    echo "Skipping run ${RUN_IDX} (previous run failed)"
+    continue
+  fi
+"""
+SINGLE_NODE_LOOP_BODY = ''.join('  ' + line + '\n' for line in TEMPLATE_BODY.splitlines())
+SINGLE_NODE_LOOP_TAIL = """\
+  exit_code=$?
+  if [ "$exit_code" -ne 0 ]; then
+    echo "Run ${RUN_IDX} failed with exit code ${exit_code}, skipping remaining runs"
+    skip_remaining=1
+  fi
+done
+"""
+
+# --single-job: every (pattern, mode, run) runs in one `job_runner.py --server`
+# process, which reads one JSON task per line from the heredoc that follows this
+# line instead of starting python3 once per run. Early-exit logic (in serve()): a
+# mode that fails is skipped for all remaining patterns.
+GLOBAL_SERVER = """\
+python3 "${JOB_RUNNER:-./job_runner.py}" --server --binary "${BINARY}" --binary-args "${BINARY_ARGS}" --singularity "${SINGULARITY}" --out-dir "${OUT_DIR}" --timeout "${TIMEOUT}" <<'TASKS'
+"""
 
 
 def find_examples(examples_dir, prefix='pattern'):
+    """Return (pattern file, partition file or None) pairs sorted by pattern number.
+
+    The partition file is <pattern>.part next to the pattern. Both are found in the
+    same directory listing; scandir's DirEntry.is_file() uses the file type from
+    that listing, so this does not stat every file.
+    """
     p = Path(examples_dir)
     if not p.exists():
         raise FileNotFoundError(f"Examples directory not found: {examples_dir}")
-    files = sorted([f for f in p.iterdir() if f.is_file() and f.name.startswith(prefix + '_') and f.name.endswith('.ltlfplus')],
-                   key=lambda x: int(x.name.replace(prefix + '_', '').replace('.ltlfplus', '')))
-    return files
+    name_re = re.compile(rf'{re.escape(prefix)}_(\d+)\.ltlfplus')
+    entries = []
+    part_names = set()
+    with os.scandir(p) as it:
+        for e in it:
+            if e.name.endswith('.part'):
+                if e.is_file():
+                    part_names.add(e.name)
+            elif (m := name_re.fullmatch(e.name)) and e.is_file():
+                entries.append((int(m.group(1)), e.path))
+    entries.sort()
+    pairs = []
+    for _, path in entries:
+        pattern = Path(path)
+        part = pattern.with_suffix('.part')
+        pairs.append((pattern, part if part.name in part_names else None))
+    return pairs
+
+
+@functools.lru_cache(maxsize=None)
+def install_job_runner(jobs_dir):
+    """Copy job_runner.py into jobs_dir so compute nodes can invoke it via an absolute path.
 
+    Done once per jobs directory, however many job scripts are written into it.
+    Returns None if the copy fails; the template then falls back to its local lookup.
+    """
+    src_runner = Path(__file__).parent / 'job_runner.py'
+    dst_runner = jobs_dir / 'job_runner.py'
+    try:
+        # copyfile copies in the kernel (sendfile) on Linux; unlike copy2 it skips
+        # copying timestamps and permission bits, which are set just below anyway
+        shutil.copyfile(src_runner, dst_runner)
+        os.chmod(dst_runner, 0o755)
+    except Exception:
+        return None
+    return dst_runner
 
-def write_job_script(out_dir, pattern_file, partition_file, binary, singularity, binary_args, timeout, runs, sbatch_opts, mode, single_node=False):
+
+# Parallel filesystems whose directory locks suffer when many tasks create files at once
+PARALLEL_FS_TYPES = frozenset(('lustre', 'gpfs'))
+DEFAULT_PARALLEL_FS_THROTTLE = 64
+
+
+def filesystem_type(path):
+    """Type of the filesystem holding path, from the longest matching /proc/mounts entry.
+
+    Returns None where /proc/mounts is not available.
+    """
+    path = os.path.realpath(path)
+    best, fs_type = '', None
+    try:
+        with open('/proc/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # mount points with spaces are escaped as \040
+                mnt = fields[1].replace('\\040', ' ')
+                if (path == mnt or path.startswith(mnt.rstrip('/') + '/')) and len(mnt) > len(best):
+                    best, fs_type = mnt, fields[2]
+    except OSError:
+        return None
+    return fs_type
+
+
+def _array_spec(n_tasks, throttle=None):
+    # `--array` value; `%T` caps how many tasks of the array Slurm runs at once
+    return f"1-{n_tasks}%{throttle}" if throttle else f"1-{n_tasks}"
+
+
+def write_job_script(out_dir, pattern_file, partition_file, binary, singularity, binary_args, timeout, runs, sbatch_opts, mode, single_node=False, array_throttle=None, ndjson=False, inline=False, shard=False):
     # Create a job script under out_dir/jobs
     job_name = pattern_file.stem
     jobs_dir = out_dir / 'jobs'
     jobs_dir.mkdir(parents=True, exist_ok=True)
     logs_dir = out_dir / 'logs'
+    if shard:
+        # logs/<mode>/ like the results; Slurm does not create the --output directory
+        logs_dir = logs_dir / mode
     logs_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy the job runner into jobs_dir so compute nodes can invoke it via an absolute path
-    src_runner = Path(__file__).parent / 'job_runner.py'
-    dst_runner = jobs_dir / 'job_runner.py'
-    try:
-        shutil.copy2(src_runner, dst_runner)
-        os.chmod(dst_runner, 0o755)
-    except Exception:
-        # If copy fails, we'll fallback to template's local lookup logic
-        dst_runner = None
+    dst_runner = install_job_runner(jobs_dir)
 
     # include mode and obligation solver in job name to distinguish jobs
     job_script = jobs_dir / f"job_{job_name}_{mode}.sh"
-    with open(TEMPLATE, 'r') as t, open(job_script, 'w') as out:
-        # Write SBATCH header
-        out.write('#!/usr/bin/env bash\n')
-        sjob = f"{job_name}_{mode}"
-        out.write(f"#SBATCH --job-name={sjob}\n")
-        out.write(f"#SBATCH --output={logs_dir}/{sjob}-%A_%a.out\n")
-        # append other sbatch opts
-        for k, v in sbatch_opts.items():
-            out.write(f"#SBATCH {k}={v}\n")
-        # array directive (skip for single-node sequential mode)
-        if not single_node:
-            out.write(f"#SBATCH --array=1-{runs}\n")
-        else:
-            # request a single node/task for sequential runs
-            out.write(f"#SBATCH --nodes=1\n")
-        out.write('\n')
-
-        # Export environment variables that template expects
-        # If running inside a Singularity image that already contains examples at /opt/examples,
-        # rewrite the paths so they point to the image's copy (avoids host path not found inside image).
-        if singularity:
-            # compute path relative to the 'examples' folder so we can point to /opt/examples/<rel>
-            parts = pattern_file.parts
-            if 'examples' in parts:
-                idx = parts.index('examples')
-                rel = Path(*parts[idx+1:])
-                container_formula = Path('/opt/examples') / rel
-            else:
-                container_formula = pattern_file
+    # Build the script in memory and write it with a single call
+    # SBATCH header
+    lines = ['#!/usr/bin/env bash\n']
+    sjob = f"{job_name}_{mode}"
+    lines.append(f"#SBATCH --job-name={sjob}\n")
+    lines.append(f"#SBATCH --output={logs_dir}/{sjob}-%A_%a.out\n")
+    # append other sbatch opts
+    for k, v in sbatch_opts.items():
+        lines.append(f"#SBATCH {k}={v}\n")
+    # array directive (skip for single-node sequential mode)
+    if not single_node:
+        lines.append(f"#SBATCH --array={_array_spec(runs, array_throttle)}\n")
+    else:
+        # request a single node/task for sequential runs
+        lines.append(f"#SBATCH --nodes=1\n")
+    lines.append('\n')
 
-            parts_p = partition_file.parts
-            if 'examples' in parts_p:
-                idxp = parts_p.index('examples')
-                relp = Path(*parts_p[idxp+1:])
-                container_partition = Path('/opt/examples') / relp
-            else:
-                container_partition = partition_file
+    # Export environment variables that template expects
+    # If running inside a Singularity image that already contains examples at /opt/examples,
+    # rewrite the paths so they point to the image's copy (avoids host path not found inside image).
+    if singularity:
+        lines.append(f"FORMULA_FILE=\"{_container_path(pattern_file)}\"\n")
+        lines.append(f"PARTITION_FILE=\"{_container_path(partition_file)}\"\n")
+    else:
+        lines.append(f"FORMULA_FILE=\"{pattern_file}\"\n")
+        lines.append(f"PARTITION_FILE=\"{partition_file}\"\n")
 
-            out.write(f"FORMULA_FILE=\"{container_formula}\"\n")
-            out.write(f"PARTITION_FILE=\"{container_partition}\"\n")
-        else:
-            out.write(f"FORMULA_FILE=\"{pattern_file}\"\n")
-            out.write(f"PARTITION_FILE=\"{partition_file}\"\n")
-
-        out.write(f"BINARY=\"{binary}\"\n")
-        out.write(f"SINGULARITY=\"{singularity or ''}\"\n")
-        # Build binary args: always start with starting player -s 0
-        # Mode-specific args
-        mode_args = ''
-        if mode == 'el':
-            # explicit obligation-simplification=0 for the EL (explicit) mode
-            mode_args = '-s 0 -g 0 --obligation-simplification 0'
-        else:
-            # optimized modes use -g 1, obligation simplification on, and -b <code>
-            mode_args = f'-s 0 -g 1 --obligation-simplification 1 -b {mode}'
+    lines.append(f"BINARY=\"{binary}\"\n")
+    lines.append(f"SINGULARITY=\"{singularity or ''}\"\n")
+    # Build binary args: always start with starting player -s 0
+    # Mode-specific args
+    mode_args = ''
+    if mode == 'el':
+        # explicit obligation-simplification=0 for the EL (explicit) mode
+        mode_args = '-s 0 -g 0 --obligation-simplification 0'
+    else:
+        # optimized modes use -g 1, obligation simplification on, and -b <code>
+        mode_args = f'-s 0 -g 1 --obligation-simplification 1 -b {mode}'
 
-        # If caller provided extra binary_args, append them
-        combined_args = (binary_args or '').strip()
-        if combined_args:
-            combined = f"{mode_args} {combined_args}"
-        else:
-            combined = mode_args
-
-        out.write(f"BINARY_ARGS=\"{combined}\"\n")
-        # Export MODE so the job_runner can pick it up and include it in the result filename
-        out.write(f"export MODE=\"{mode}\"\n")
-        out.write(f"OUT_DIR=\"{out_dir / 'results'}\"\n")
-        out.write(f"TIMEOUT=\"{timeout}\"\n")   
-        if not single_node:
-            out.write(f"RUN_IDX=\"${{SLURM_ARRAY_TASK_ID}}\"\n")
-
-        # Inject JOB_RUNNER absolute path (so template doesn't rely on $0-based lookup)
-        if dst_runner is not None:
-            out.write(f"JOB_RUNNER=\"{dst_runner}\"\n")
-        out.write('\n')
-
-        # Append the body of the template (skip its shebang)
-        with open(TEMPLATE, 'r') as tmpl:
-            tmpl_text = tmpl.read()
-        # write everything after the first line
-        tmpl_body = '\n'.join(tmpl_text.splitlines()[1:])
-        if single_node:
-            # Wrap the template body in a loop that sets RUN_IDX for each sequential run
-            # with early-exit logic: skip remaining runs if one fails
-            out.write('skip_remaining=0\n')
-            out.write(f"for RUN_IDX in $(seq 1 {runs}); do\n")
-            out.write('  if [ "$skip_remaining" -eq 1 ]; then\n')
-            out.write('    echo "Skipping run ${RUN_IDX} (previous run failed)"\n')
-            out.write('    continue\n')
-            out.write('  fi\n')
-            # indent the template body
-            for line in tmpl_body.splitlines():
-                out.write('  ' + line + '\n')
-            out.write('  exit_code=$?\n')
-            out.write('  if [ "$exit_code" -ne 0 ]; then\n')
-            out.write('    echo "Run ${RUN_IDX} failed with exit code ${exit_code}, skipping remaining runs"\n')
-            out.write('    skip_remaining=1\n')
-            out.write('  fi\n')
-            out.write('done\n')
-        else:
-            out.write(tmpl_body)
+    # If caller provided extra binary_args, append them
+    combined_args = (binary_args or '').strip()
+    if combined_args:
+        combined = f"{mode_args} {combined_args}"
+    else:
+        combined = mode_args
+
+    lines.append(f"BINARY_ARGS=\"{combined}\"\n")
+    # Export MODE so the job_runner can pick it up and include it in the result filename
+    lines.append(f"export MODE=\"{mode}\"\n")
+    results_dir = out_dir / 'results' / mode / job_name if shard else out_dir / 'results'
+    lines.append(f"OUT_DIR=\"{results_dir}\"\n")
+    lines.append(f"TIMEOUT=\"{timeout}\"\n")   
+    if not single_node:
+        lines.append(f"RUN_IDX=\"${{SLURM_ARRAY_TASK_ID}}\"\n")
+    if ndjson:
+        lines.append(_ndjson_export(out_dir))
+
+    # Inject JOB_RUNNER absolute path (so template doesn't rely on $0-based lookup)
+    if dst_runner is not None:
+        lines.append(f"JOB_RUNNER=\"{dst_runner}\"\n")
+    lines.append('\n')
+
+    # Append the body of the template (skip its shebang)
+    if single_node:
+        # Wrap the (indented) template body in a loop that sets RUN_IDX for each
+        # sequential run
+        lines.append(SINGLE_NODE_LOOP_HEAD % runs)
+        lines.append(SINGLE_NODE_LOOP_BODY)
+        lines.append(SINGLE_NODE_LOOP_TAIL)
+    else:
+        lines.append(TEMPLATE_BODY)
 
-    os.chmod(job_script, 0o755)
+    return _write_script(job_script, ''.join(lines), inline)
+
+
+# A job script that is piped to sbatch's stdin (--inline-submit) instead of being
+# written to `path`; Slurm keeps its own copy of the script either way
+InlineScript = namedtuple('InlineScript', 'path text')
+
+
+def _write_script(job_script, text, inline=False):
+    if inline:
+        return InlineScript(job_script, text)
+    # A run directory reused with --run-name usually already holds the same script;
+    # leave it untouched then (a read instead of a rewrite on the shared filesystem)
+    data = text.encode()
+    try:
+        if job_script.stat().st_size == len(data) and job_script.read_bytes() == data:
+            return job_script
+    except OSError:
+        pass
+    # Write under a temporary name and rename into place, so an interrupted
+    # submitter never leaves a truncated script behind for a later --run-name
+    fd, tmp = tempfile.mkstemp(dir=job_script.parent, prefix=f".{job_script.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            os.fchmod(f.fileno(), 0o755)
+        os.replace(tmp, job_script)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
     return job_script
 
 
+def _ndjson_export(out_dir):
+    # One NDJSON file per (job, node): job_runner appends each report as a line under
+    # flock, which is only reliable between processes on the same node on most
+    # network filesystems, and the results directory gets a handful of files
+    # instead of one per run.
+    return (f"export JOB_RUNNER_NDJSON=\"{out_dir / 'results'}/"
+            "${SLURM_ARRAY_JOB_ID:-$SLURM_JOB_ID}.${SLURMD_NODENAME:-$(hostname -s)}.ndjson\"\n")
+
+
+@functools.lru_cache(maxsize=None)
+def _container_path(path):
+    # Inside the Singularity image the examples live under /opt/examples; every
+    # pattern is looked up once per mode, so the result is cached
+    parts = Path(path).parts
+    if 'examples' in parts:
+        idx = parts.index('examples')
+        return Path('/opt/examples') / Path(*parts[idx+1:])
+    return Path(path)
+
+
+def write_array_job_script(out_dir, patterns, modes, binary, singularity, binary_args, timeout, runs, sbatch_opts, array_throttle=None, ndjson=False, inline=False, shard=False):
+    """Write one Slurm array job covering every (pattern, mode, run) combination.
+
+    Task k (1-based) runs run ((k-1) % runs) + 1 of mode ((k-1) // runs) % len(modes)
+    on pattern (k-1) // (runs * len(modes)), so the whole sweep is a single sbatch call.
+    `patterns` is a list of (formula, partition) paths.
+    """
+    jobs_dir = out_dir / 'jobs'
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    logs_dir = out_dir / 'logs'
+    logs_dir.mkdir(parents=True, exist_ok=True)
+
+    dst_runner = install_job_runner(jobs_dir)
+
+    n_tasks = len(patterns) * len(modes) * runs
+    job_script = jobs_dir / 'job_array_all.sh'
+    sjob = 'bench_array'
+    lines = [
+        '#!/usr/bin/env bash\n',
+        f"#SBATCH --job-name={sjob}\n",
+        f"#SBATCH --output={logs_dir}/{sjob}-%A_%a.out\n",
+    ]
+    lines += [f"#SBATCH {k}={v}\n" for k, v in sbatch_opts.items()]
+    lines.append(f"#SBATCH --array={_array_spec(n_tasks, array_throttle)}\n\n")
+
+    lines.append(f"BINARY=\"{binary}\"\n")
+    lines.append(f"SINGULARITY=\"{singularity or ''}\"\n")
+    lines.append(f"OUT_DIR=\"{out_dir / 'results'}\"\n")
+    lines.append(f"TIMEOUT=\"{timeout}\"\n")
+    if ndjson:
+        lines.append(_ndjson_export(out_dir))
+    if dst_runner is not None:
+        lines.append(f"JOB_RUNNER=\"{dst_runner}\"\n")
+    lines.append('\nFORMULAS=(\n')
+    lines += [f"  \"{_container_path(f) if singularity else f}\"\n" for f, _ in patterns]
+    lines.append(')\nPARTS=(\n')
+    lines += [f"  \"{_container_path(p) if singularity else p}\"\n" for _, p in patterns]
+    lines.append(')\nMODES=(\n')
+    lines += [f"  \"{m}\"\n" for m in modes]
+    lines.append(')\n\n')
+
+    extra_args = (binary_args or '').strip()
+    lines += [
+        '# Map the array task id to (pattern, mode, run); runs vary fastest\n',
+        'task=$((SLURM_ARRAY_TASK_ID - 1))\n',
+        f"RUN_IDX=$((task % {runs} + 1))\n",
+        f"combo=$((task / {runs}))\n",
+        'export MODE="${MODES[$((combo % ${#MODES[@]}))]}"\n',
+        'i=$((combo / ${#MODES[@]}))\n',
+        'FORMULA_FILE="${FORMULAS[$i]}"\n',
+        'PARTITION_FILE="${PARTS[$i]}"\n',
+    ]
+    if shard:
+        # results/<mode>/<pattern stem>/, as in write_job_script
+        lines += [
+            'stem="${FORMULA_FILE##*/}"\n',
+            'OUT_DIR="${OUT_DIR}/${MODE}/${stem%.*}"\n',
+        ]
+    lines += [
+        'if [ "$MODE" = "el" ]; then\n',
+        '  BINARY_ARGS="-s 0 -g 0 --obligation-simplification 0"\n',
+        'else\n',
+        '  BINARY_ARGS="-s 0 -g 1 --obligation-simplification 1 -b ${MODE}"\n',
+        'fi\n',
+    ]
+    if extra_args:
+        lines.append(f"BINARY_ARGS=\"${{BINARY_ARGS}} {extra_args}\"\n")
+    lines.append('\n')
+
+    lines.append(TEMPLATE_BODY)
+
+    return _write_script(job_script, ''.join(lines), inline)
+
+
 TRANSIENT_SBATCH_ERRORS = (
     'socket timed out',
     'connection timed out',
     'communications connection failure',
+    'unexpected message received',
+    'zero bytes were transmitted or received',
+    'slurm_receive_msg',
+    'unable to contact slurm controller',
+    'resource temporarily unavailable',
+    'temporarily unable',
 )
 
+# Errors that a retry cannot fix; these fail at once even if the message also
+# contains one of the transient signatures above
+PERMANENT_SBATCH_ERRORS = (
+    'invalid account',
+    'invalid partition',
+    'invalid qos',
+    'access/permission denied',
+    'requested node configuration is not available',
+    'memory specification can not be satisfied',
+    'unrecognized option',
+)
+
+
+# Concurrent sbatch calls when submitting one job per (pattern, mode); kept modest
+# so the submitter does not itself overload slurmctld
+SUBMIT_WORKERS = 8
+
 
 def submit_script(script_path, retries=3, retry_delay=5.0, retry_backoff=2.0):
-    # Submit with sbatch and return job id (parsable form)
+    # Submit with sbatch and return job id (parsable form); an InlineScript is
+    # passed on stdin, where sbatch reads the script when no file is given
+    if isinstance(script_path, InlineScript):
+        cmd, stdin, script_path = ['sbatch', '--parsable'], script_path.text, script_path.path
+    else:
+        cmd, stdin = ['sbatch', '--parsable', str(script_path)], None
     max_attempts = max(1, retries)
     delay = retry_delay
     for attempt in range(1, max_attempts + 1):
         try:
-            res = subprocess.run(['sbatch', '--parsable', str(script_path)], capture_output=True, text=True, check=True)
+            res = subprocess.run(cmd, input=stdin, capture_output=True, text=True, check=True)
             jobid = res.stdout.strip()
             print(f"Submitted {script_path.name} -> job {jobid}")
             return jobid
@@ -184,47 +423,377 @@ def submit_script(script_path, retries=3, retry_delay=5.0, retry_backoff=2.0):
             stderr = (e.stderr or '').strip()
             stdout = (e.stdout or '').strip()
             combined = '\n'.join(filter(None, [stderr, stdout])).lower()
-            is_transient = any(pattern in combined for pattern in TRANSIENT_SBATCH_ERRORS)
+            is_transient = (any(pattern in combined for pattern in TRANSIENT_SBATCH_ERRORS)
+                            and not any(pattern in combined for pattern in PERMANENT_SBATCH_ERRORS))
             if is_transient and attempt < max_attempts:
-                print(f"sbatch transient failure (attempt {attempt}/{max_attempts}): {stderr or stdout}. Retrying in {delay:.1f}s...",
+                # up to 20% jitter so concurrent submissions do not retry in lockstep
+                wait = delay * random.uniform(1.0, 1.2)
+                print(f"sbatch transient failure (attempt {attempt}/{max_attempts}): {stderr or stdout}. Retrying in {wait:.1f}s...",
                       file=sys.stderr)
-                time.sleep(delay)
+                time.sleep(wait)
                 delay *= retry_backoff if retry_backoff > 0 else 1
                 continue
             print('sbatch failed:', stderr or stdout, file=sys.stderr)
             raise
 
 
-def wait_for_results(out_dir, expected_count, timeout_s=3600, poll_interval=10):
+class _ResultCounter:
+    """Counts finished runs in a results directory (including --shard-results
+    subdirectories): one per .json file plus one per line of each .ndjson file.
+    NDJSON files only grow, so each rescan reads just the bytes appended since the
+    previous one."""
+
+    def __init__(self, results_dir):
+        self.results_dir = str(results_dir)
+        self.json_paths = set()
+        self.ndjson = {}  # path -> (bytes read, complete lines)
+        self.ndjson_lines = 0
+
+    def add_json(self, path):
+        self.json_paths.add(path)
+
+    def scan(self, need=None):
+        """Rescan the results directory; with `need`, stop as soon as the count reaches it
+        (the count never decreases, so the rest of the listing cannot change the outcome)."""
+        dirs = [self.results_dir]
+        while dirs:
+            try:
+                it = os.scandir(dirs.pop())
+            except FileNotFoundError:
+                continue
+            with it:
+                for e in it:
+                    if e.name.endswith('.json'):
+                        self.json_paths.add(e.path)
+                    elif e.name.endswith('.ndjson'):
+                        self._read_ndjson(e)
+                    elif e.is_dir(follow_symlinks=False):
+                        dirs.append(e.path)
+                        continue
+                    else:
+                        continue
+                    if need is not None and self.count() >= need:
+                        return self.count()
+        return self.count()
+
+    def _read_ndjson(self, entry):
+        # every run is one newline-terminated line, so newlines can be counted
+        # incrementally even if the last read ended in the middle of a line
+        offset, lines = self.ndjson.get(entry.path, (0, 0))
+        try:
+            with open(entry.path, 'rb') as f:
+                f.seek(offset)
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    lines += chunk.count(b'\n')
+                    offset += len(chunk)
+        except OSError:
+            return
+        self.ndjson_lines += lines - self.ndjson.get(entry.path, (0, 0))[1]
+        self.ndjson[entry.path] = (offset, lines)
+
+    def count(self):
+        return len(self.json_paths) + self.ndjson_lines
+
+
+# sacct states of jobs (or array tasks) that may still write results
+ACTIVE_JOB_STATES = frozenset((
+    'PENDING', 'RUNNING', 'REQUEUED', 'REQUEUE_HOLD', 'REQUEUE_FED', 'RESIZING',
+    'SUSPENDED', 'CONFIGURING', 'COMPLETING', 'STAGE_OUT', 'SIGNALING',
+))
+
+
+def _active_jobs(job_ids):
+    """Number of the given jobs/array tasks that sacct reports as not finished yet.
+
+    Falls back to squeue without job accounting; returns None if neither can be used.
+    """
+    try:
+        res = subprocess.run(['sacct', '-j', ','.join(job_ids), '-n', '-X', '-P', '-o', 'JobID,State'],
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return _queued_jobs(job_ids)
+    states = [line.split('|')[1] for line in res.stdout.splitlines() if '|' in line]
+    if not states:
+        # freshly submitted jobs may not have reached the accounting database yet
+        return len(job_ids)
+    # e.g. 'CANCELLED by 1234' -> 'CANCELLED'
+    return sum(1 for st in states if st.split(' ', 1)[0] in ACTIVE_JOB_STATES)
+
+
+def _queued_jobs(job_ids):
+    # squeue only knows jobs that are queued, running or finished very recently;
+    # one line per array task (-r)
+    try:
+        res = subprocess.run(['squeue', '-h', '-r', '-j', ','.join(job_ids), '-o', '%T'],
+                             capture_output=True, text=True)
+    except OSError:
+        return None
+    if res.returncode != 0:
+        # all of the jobs have left the queue
+        return 0 if 'invalid job id' in res.stderr.lower() else None
+    return sum(1 for st in res.stdout.split() if st in ACTIVE_JOB_STATES)
+
+
+def wait_for_results(out_dir, expected_count, timeout_s=3600, poll_interval=10, job_ids=None, max_poll_interval=None):
+    # main() creates the results directory; until a job creates it, nothing is counted
     results_dir = out_dir / 'results'
-    results_dir.mkdir(parents=True, exist_ok=True)
     start = time.time()
-    while True:
-        files = list(results_dir.glob('*.json'))
-        if len(files) >= expected_count:
-            return True
-        if time.time() - start > timeout_s:
-            return False
-        time.sleep(poll_interval)
 
+    # Ask the scheduler when the submitted jobs are done instead of listing the
+    # (shared, possibly huge) results directory on every poll; the directory is
+    # only counted once at the end (squeue stands in for sacct without job
+    # accounting). Falls back to counting files if neither is available.
+    # While no job finishes, the sacct interval grows by 1.5x up to max_poll_interval
+    # (with +-10% jitter so concurrent submitters drift apart); it drops back to
+    # poll_interval as soon as the number of active jobs changes.
+    if job_ids and (shutil.which('sacct') or shutil.which('squeue')):
+        # sbatch --parsable prints '<jobid>[;<cluster>]'
+        ids = [str(j).split(';', 1)[0] for j in job_ids]
+        max_poll_interval = max(poll_interval, max_poll_interval or poll_interval)
+        interval, last_active = poll_interval, None
+        while True:
+            active = _active_jobs(ids)
+            if active is None:
+                break
+            if active == 0:
+                return _ResultCounter(results_dir).scan() >= expected_count
+            remaining = timeout_s - (time.time() - start)
+            if remaining <= 0:
+                return False
+            if last_active is not None and active == last_active:
+                interval = min(interval * 1.5, max_poll_interval)
+            else:
+                interval = poll_interval
+            last_active = active
+            time.sleep(min(remaining, interval * random.uniform(0.9, 1.1)))
 
-def aggregate(out_dir, aggregated_file):
-    # Read all per-run JSONs and group by pattern file
-    results_dir = out_dir / 'results'
-    entries = list(results_dir.glob('*.json'))
-    data = {}
-    for p in entries:
+    counter = _ResultCounter(results_dir)
+    wake = threading.Event()
+    rescan = threading.Event()  # an NDJSON file changed; rescan at most once a second
+    observer = None
+    if Observer is not None:
+        # With watchdog installed, result files are counted as they are created or
+        # renamed into place, and appends to NDJSON files trigger an early rescan.
+        # Events for writes made on other nodes of a network filesystem may never
+        # arrive, so the periodic rescan below is kept.
+        class _OnResult(FileSystemEventHandler):
+            def on_created(self, event):
+                self._add(event.src_path)
+
+            def on_moved(self, event):
+                self._add(event.dest_path)
+
+            def on_modified(self, event):
+                if event.src_path.endswith('.ndjson'):
+                    rescan.set()
+                    wake.set()
+
+            def _add(self, path):
+                if path.endswith('.json'):
+                    counter.add_json(path)
+                    wake.set()
+                elif path.endswith('.ndjson'):
+                    rescan.set()
+                    wake.set()
+
+        observer = Observer()
         try:
-            with open(p, 'r') as f:
-                r = json.load(f)
+            observer.schedule(_OnResult(), str(results_dir), recursive=True)
+            observer.start()
+        except OSError:
+            # e.g. the results directory does not exist (yet); rely on rescans
+            observer = None
+    try:
+        next_scan = last_scan = 0.0
+        while True:
+            now = time.time()
+            if now >= next_scan or (rescan.is_set() and now >= last_scan + 1.0):
+                rescan.clear()
+                counter.scan(expected_count)
+                last_scan = now
+                next_scan = now + poll_interval
+            if counter.count() >= expected_count:
+                return True
+            if now - start > timeout_s:
+                return False
+            wait_until = min(next_scan, last_scan + 1.0) if rescan.is_set() else next_scan
+            wake.wait(max(0.0, wait_until - time.time()))
+            wake.clear()
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+# Below this many run files the process pool startup costs more than it saves
+PARALLEL_MIN_FILES = 256
+
+
+def _encode_run(p):
+    """Parse one run file and return its runs as a list of (group key, indented JSON bytes).
+
+    .ndjson files hold one run per line; unreadable files and lines are skipped.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        raw = p.read_bytes()
+    except OSError:
+        return []
+    chunks = raw.splitlines() if p.suffix == '.ndjson' else [raw]
+    out = []
+    for chunk in chunks:
+        try:
+            r = loads(chunk)
         except Exception:
+            # e.g. a line cut short by a job killed mid-append
             continue
-        key = os.path.basename(r.get('pattern_file') or p.name)
-        data.setdefault(key, []).append(r)
-    with open(aggregated_file, 'w') as f:
-        json.dump({'generated_at': time.time(), 'results': data}, f, indent=2)
-    print(f"Aggregated {len(entries)} run files -> {aggregated_file}")
+        key = r.get('pattern_file')
+        # basename of pattern_file (the job scripts always pass POSIX paths)
+        key = key[key.rfind('/') + 1:] if key else p.name
+        out.append((key, _dumps(r)))
+    return out
+
 
+# Encoded runs of earlier aggregate() calls, kept in the run directory so a repeated
+# --aggregate only parses files that are new or changed since then
+AGG_SPOOL_NAME = '.aggregate_spool'
+AGG_INDEX_NAME = '.aggregate_index.json'
+_AGG_INDEX_VERSION = 1
+
+
+def _load_agg_index(index_path, spool_size):
+    # {(path, mtime_ns, size): [(group key, offset, length), ...]}; only valid if the
+    # spool (which is only ever appended to) is at least as long as when it was saved.
+    # Stored as plain JSON, so a file planted in a shared run directory can at worst
+    # point at the wrong spool records, never run code
+    try:
+        with open(index_path, 'rb') as f:
+            data = json.load(f)
+        if data.get('version') != _AGG_INDEX_VERSION or spool_size < data['spool_size']:
+            return {}
+        return {(path, mtime_ns, size): [(key, offset, length) for key, offset, length in spans]
+                for path, mtime_ns, size, spans in data['files']}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}
+
+
+def _store_agg_index(index_path, spool_size, index):
+    data = {
+        'version': _AGG_INDEX_VERSION,
+        'spool_size': spool_size,
+        'files': [[path, mtime_ns, size, spans] for (path, mtime_ns, size), spans in index.items()],
+    }
+    tmp = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, index_path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def aggregate(out_dir, aggregated_file, use_cache=True):
+    # Read all per-run JSONs and group by pattern file. Each run is encoded into a
+    # spool file as soon as it is parsed and only its (offset, length) is kept, so
+    # memory does not grow with the size of the runs; the output (same layout as
+    # json.dump(..., indent=2)) is then streamed group by group.
+    # The spool and an index of the files it holds (keyed by path, mtime and size)
+    # are kept in out_dir, so files already seen by an earlier call are not parsed
+    # again. Without a writable out_dir a temporary spool is used.
+    # Large sweeps are parsed and encoded in worker processes; results come back
+    # in file order, so the output is the same as with the serial path.
+    results_dir = out_dir / 'results'
+    entries = list(results_dir.rglob('*.json')) + list(results_dir.rglob('*.ndjson'))
+    index_path = out_dir / AGG_INDEX_NAME
+    spool = None
+    if use_cache:
+        try:
+            spool = open(out_dir / AGG_SPOOL_NAME, 'a+b')
+        except OSError:
+            pass
+    if spool is None:
+        use_cache = False
+        spool = tempfile.TemporaryFile()
+    groups = defaultdict(list)
+    n_runs = 0
+    with spool:
+        end = spool.seek(0, os.SEEK_END)
+        index = _load_agg_index(index_path, end) if use_cache else {}
+        keys = []
+        for p in entries:
+            try:
+                st = p.stat()
+                keys.append((str(p), st.st_mtime_ns, st.st_size))
+            except OSError:
+                keys.append(None)
+        reuse = [index.get(k) for k in keys]
+        live = sum(length for spans in reuse if spans for _, _, length in spans)
+        if end - live > live:
+            # mostly stale records (changed or removed files): start a fresh spool
+            spool.truncate(0)
+            end, live = 0, 0
+            reuse = [None] * len(entries)
+        todo = [p for p, spans in zip(entries, reuse) if spans is None]
+
+        if len(todo) >= PARALLEL_MIN_FILES:
+            ex = ProcessPoolExecutor()
+            encoded = ex.map(_encode_run, todo, chunksize=64)
+        else:
+            ex = None
+            encoded = map(_encode_run, todo)
+        new_index = {}
+        try:
+            for k, spans in zip(keys, reuse):
+                if spans is None:
+                    spans = []
+                    for key, rec in next(encoded):
+                        spans.append((key, end, len(rec)))
+                        spool.write(rec)
+                        end += len(rec)
+                if k is not None:
+                    new_index[k] = spans
+                for key, offset, length in spans:
+                    groups[key].append((offset, length))
+                n_runs += len(spans)
+        finally:
+            if ex is not None:
+                ex.shutdown()
+
+        # written under a temporary name and renamed into place, so an interrupted
+        # aggregation never leaves a truncated aggregated file behind
+        tmp_file = f"{aggregated_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as out:
+                out.write(b'{\n  "generated_at": ' + _dumps(time.time()) + b',\n  "results": {')
+                for gi, (key, spans) in enumerate(groups.items()):
+                    out.write((b',' if gi else b'') + b'\n    ' + _dumps(key) + b': [')
+                    for i, (offset, length) in enumerate(spans):
+                        spool.seek(offset)
+                        # JSON strings never contain raw newlines, so re-indenting is a plain replace
+                        rec = spool.read(length).replace(b'\n', b'\n      ')
+                        out.write((b',' if i else b'') + b'\n      ' + rec)
+                    out.write(b'\n    ]')
+                out.write(b'\n  }\n}' if groups else b'}\n}')
+            os.replace(tmp_file, aggregated_file)
+        except BaseException:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+        if use_cache and (todo or len(new_index) != len(index)):
+            spool.flush()
+            _store_agg_index(index_path, end, new_index)
+    print(f"Aggregated {n_runs} runs from {len(entries)} files ({len(todo)} parsed) -> {aggregated_file}")
 
 def main():
     parser = argparse.ArgumentParser(description='Submit benchmark jobs to Slurm (pattern directory)')
@@ -236,7 +805,14 @@ def main():
     parser.add_argument('--singularity', default='', help='Path to singularity image (optional)')
     parser.add_argument('--binary-args', default='', help='Extra arguments to binary (quoted)')
     parser.add_argument('--out-dir', default='bench_out', help='Directory for jobs/logs/results')
+    parser.add_argument('--run-name', default=None,
+                        help='Run subdirectory under OUT_DIR (default: <timestamp>-<pattern>); reusing one, e.g. to '
+                             'resubmit after a partial failure, only rewrites job scripts whose content changed')
     parser.add_argument('--wait', action='store_true', help='Wait for all runs to finish (polling)')
+    parser.add_argument('--poll-interval', type=float, default=os.environ.get('LYDIA_SLURM_POLL_INTERVAL', '30'),
+                        help='Seconds between job state checks with --wait (default: $LYDIA_SLURM_POLL_INTERVAL or 30)')
+    parser.add_argument('--poll-max-interval', type=float, default=300,
+                        help='Upper bound for the poll interval, which backs off while no job finishes (default: 300)')
     parser.add_argument('--aggregate', action='store_true', help='Aggregate per-run JSONs into one file after completion')
     parser.add_argument('--sbatch-time', default='00:10:00', help='Slurm time limit (e.g. 00:10:00)')
     parser.add_argument('--sbatch-mem', default='16G', help='Slurm memory per task')
@@ -250,10 +826,31 @@ def main():
                         help='Multiplicative backoff applied to the retry delay (default: 2.0)')
     parser.add_argument('--single-node', action='store_true', help='Run all runs for a pattern sequentially in a single Slurm job (no array)')
     parser.add_argument('--single-job', action='store_true', help='Run all patterns and modes sequentially in one Slurm job on a single node')
+    parser.add_argument('--single-array', action='store_true',
+                        help='Submit all patterns x modes x runs as one Slurm array job (one sbatch call); '
+                             'the total must fit within the cluster\'s MaxArraySize')
+    parser.add_argument('--array-throttle', type=int, default=None,
+                        help='Let at most N tasks of each array job run at once (sbatch --array=...%%N); '
+                             f'defaults to {DEFAULT_PARALLEL_FS_THROTTLE} when OUT_DIR is on Lustre/GPFS, 0 disables')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Append run reports to one NDJSON file per job and node instead of one JSON file per run')
+    parser.add_argument('--shard-results', action='store_true',
+                        help='Write per-run JSONs to OUT_DIR/results/<mode>/<pattern>/ (and per-pattern job logs to '
+                             'OUT_DIR/logs/<mode>/) instead of flat directories')
+    parser.add_argument('--inline-submit', action='store_true',
+                        help='Pass job scripts to sbatch on stdin instead of writing them to OUT_DIR/jobs')
+    parser.add_argument('--serial-submit', action='store_true',
+                        help=f'Submit job scripts one at a time instead of {SUBMIT_WORKERS} sbatch calls in parallel')
     parser.add_argument('--max-examples', type=int, default=None, help='Limit to first N examples')
     parser.add_argument('--modes', type=str, default='el,cl,pm,wg,cb',
                         help='Comma-separated solver modes to run: el,cl,pm,wg,cb (default: all)')
     args = parser.parse_args()
+    if args.timeout <= 0:
+        # job_runner.py rejects it too, but only once the jobs have started
+        parser.error('--timeout must be a positive number of seconds')
+    for opt, val in (('--poll-interval', args.poll_interval), ('--poll-max-interval', args.poll_max_interval)):
+        if not val > 0:
+            parser.error(f'{opt} must be a positive number of seconds')
 
     # Determine examples dir
     if args.examples_dir:
@@ -275,13 +872,23 @@ def main():
     # Create a timestamped run subdirectory so separate invocations don't overwrite each other.
     # Format: YYYY-MM-DD-HHMM-<pattern>
     # include seconds to make the run directory unique even for rapid successive runs
-    timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
-    run_subdir_name = f"{timestamp}-{args.pattern}"
+    if args.run_name:
+        run_subdir_name = args.run_name
+    else:
+        timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+        run_subdir_name = f"{timestamp}-{args.pattern}"
     run_out_dir = out_dir / run_subdir_name
     (run_out_dir / 'results').mkdir(parents=True, exist_ok=True)
     (run_out_dir / 'logs').mkdir(parents=True, exist_ok=True)
     (run_out_dir / 'jobs').mkdir(parents=True, exist_ok=True)
 
+    if args.array_throttle is None:
+        fs_type = filesystem_type(run_out_dir)
+        if fs_type in PARALLEL_FS_TYPES:
+            args.array_throttle = DEFAULT_PARALLEL_FS_THROTTLE
+            print(f"Results directory is on {fs_type}: limiting array jobs to {args.array_throttle} concurrent tasks "
+                  "(override with --array-throttle)")
+
     sbatch_opts = {
         '--time': args.sbatch_time,
         '--mem': args.sbatch_mem,
@@ -336,145 +943,62 @@ def main():
             sbatch_opts['--time'] = f"{hh:02d}:{mm:02d}:{ss:02d}"
             print(f"Auto-calculated time limit for single-job: {sbatch_opts['--time']} ({len(examples)} patterns × {len(modes)} modes × {args.runs} runs × {args.timeout}s)")
         
-        def write_global_job_script(out_dir, patterns, modes, binary, singularity, binary_args, timeout, runs, sbatch_opts):
+        def write_global_job_script(out_dir, patterns, modes, binary, singularity, binary_args, timeout, runs, sbatch_opts, ndjson=False, inline=False, shard=False):
+            # main() has already created jobs/ and logs/
             jobs_dir = out_dir / 'jobs'
-            jobs_dir.mkdir(parents=True, exist_ok=True)
             logs_dir = out_dir / 'logs'
-            logs_dir.mkdir(parents=True, exist_ok=True)
 
-            # Copy runner
-            src_runner = Path(__file__).parent / 'job_runner.py'
-            dst_runner = jobs_dir / 'job_runner.py'
-            try:
-                shutil.copy2(src_runner, dst_runner)
-                os.chmod(dst_runner, 0o755)
-            except Exception:
-                dst_runner = None
+            dst_runner = install_job_runner(jobs_dir)
 
             job_script = jobs_dir / f"job_all_patterns.sh"
-            with open(TEMPLATE, 'r') as t, open(job_script, 'w') as out:
-                out.write('#!/usr/bin/env bash\n')
-                sjob = 'bench_all'
-                out.write(f"#SBATCH --job-name={sjob}\n")
-                out.write(f"#SBATCH --output={logs_dir}/{sjob}-%A.out\n")
-                for k, v in sbatch_opts.items():
-                    out.write(f"#SBATCH {k}={v}\n")
-                # single node for the whole job
-                out.write(f"#SBATCH --nodes=1\n")
-                out.write('\n')
-
-                out.write(f"BINARY=\"{binary}\"\n")
-                out.write(f"SINGULARITY=\"{singularity or ''}\"\n")
-                out.write(f"BINARY_ARGS=\"{(binary_args or '').strip()}\"\n")
-                out.write(f"OUT_DIR=\"{out_dir / 'results'}\"\n")
-                out.write(f"TIMEOUT=\"{timeout}\"\n")
-                if dst_runner is not None:
-                    out.write(f"JOB_RUNNER=\"{dst_runner}\"\n")
-                out.write('\n')
-
-                # Prepare arrays of formulas and partitions
-                # If using Singularity, rewrite paths to point to /opt/examples inside container
-                out.write('FORMULAS=(\n')
-                for p in patterns:
-                    if singularity:
-                        # Rewrite path for Singularity container
-                        parts = Path(p).parts
-                        if 'examples' in parts:
-                            idx = parts.index('examples')
-                            rel = Path(*parts[idx+1:])
-                            container_path = Path('/opt/examples') / rel
-                        else:
-                            container_path = Path(p)
-                        out.write(f"  \"{container_path}\"\n")
-                    else:
-                        out.write(f"  \"{p}\"\n")
-                out.write(')\n')
-                out.write('PARTS=(\n')
-                for p in patterns:
-                    part_path = Path(p).with_suffix('.part')
-                    if singularity:
-                        # Rewrite path for Singularity container
-                        parts = part_path.parts
-                        if 'examples' in parts:
-                            idx = parts.index('examples')
-                            rel = Path(*parts[idx+1:])
-                            container_path = Path('/opt/examples') / rel
-                        else:
-                            container_path = part_path
-                        out.write(f"  \"{container_path}\"\n")
-                    else:
-                        out.write(f"  \"{part_path}\"\n")
-                out.write(')\n')
-                out.write('\n')
+            # buffer the whole script and write it with a single call
+            buf = io.StringIO()
+            buf.write('#!/usr/bin/env bash\n')
+            sjob = 'bench_all'
+            buf.write(f"#SBATCH --job-name={sjob}\n")
+            buf.write(f"#SBATCH --output={logs_dir}/{sjob}-%A.out\n")
+            for k, v in sbatch_opts.items():
+                buf.write(f"#SBATCH {k}={v}\n")
+            # single node for the whole job
+            buf.write(f"#SBATCH --nodes=1\n")
+            buf.write('\n')
 
-                # modes list
-                out.write('MODES=(\n')
+            buf.write(f"BINARY=\"{binary}\"\n")
+            buf.write(f"SINGULARITY=\"{singularity or ''}\"\n")
+            buf.write(f"BINARY_ARGS=\"{(binary_args or '').strip()}\"\n")
+            buf.write(f"OUT_DIR=\"{out_dir / 'results'}\"\n")
+            buf.write(f"TIMEOUT=\"{timeout}\"\n")
+            if ndjson:
+                buf.write(_ndjson_export(out_dir))
+            if dst_runner is not None:
+                buf.write(f"JOB_RUNNER=\"{dst_runner}\"\n")
+            buf.write('\n')
+
+            # One JSON task per (pattern, mode, run), in the order the runs should happen.
+            # If using Singularity, rewrite paths to point to /opt/examples inside container
+            buf.write(GLOBAL_SERVER)
+            for p in patterns:
+                part_path = Path(p).with_suffix('.part')
+                formula = str(_container_path(p)) if singularity else str(p)
+                partition = str(_container_path(part_path)) if singularity else str(part_path)
                 for m in modes:
-                    out.write(f"  \"{m}\"\n")
-                out.write(')\n')
-                out.write('\n')
-
-                # Loop over patterns, modes, and runs
-                # Early-exit logic: track failed modes globally and skip them for all remaining patterns
-                out.write('# Initialize array to track which modes have failed\n')
-                out.write('declare -A skip_mode\n')
-                out.write('for mode in "${MODES[@]}"; do\n')
-                out.write('  skip_mode[$mode]=0\n')
-                out.write('done\n')
-                out.write('\n')
-                out.write('for i in "${!FORMULAS[@]}"; do\n')
-                out.write('  formula="${FORMULAS[$i]}"\n')
-                out.write('  partition="${PARTS[$i]}"\n')
-                out.write('  for mode in "${MODES[@]}"; do\n')
-                out.write('    # Check if this mode has already failed on a previous pattern\n')
-                out.write('    if [ "${skip_mode[$mode]}" -eq 1 ]; then\n')
-                out.write('      echo "Skipping formula=${formula}, mode=${mode} (mode failed on earlier pattern)"\n')
-                out.write('      continue\n')
-                out.write('    fi\n')
-                out.write('    # Set mode-specific binary arguments\n')
-                out.write('    if [ "$mode" = "el" ]; then\n')
-                out.write('      MODE_ARGS="-s 0 -g 0 --obligation-simplification 0"\n')
-                out.write('    else\n')
-                out.write('      MODE_ARGS="-s 0 -g 1 --obligation-simplification 1 -b ${mode}"\n')
-                out.write('    fi\n')
-                out.write('    # Combine with user-provided binary args\n')
-                out.write('    if [ -n "${BINARY_ARGS}" ]; then\n')
-                out.write('      COMBINED_ARGS="${MODE_ARGS} ${BINARY_ARGS}"\n')
-                out.write('    else\n')
-                out.write('      COMBINED_ARGS="${MODE_ARGS}"\n')
-                out.write('    fi\n')
-                out.write('    skip_remaining_runs=0\n')
-                out.write('    for RUN_IDX in $(seq 1 %d); do\n' % runs)
-                out.write('      if [ "$skip_remaining_runs" -eq 1 ]; then\n')
-                out.write('        echo "Skipping formula=${formula}, mode=${mode}, run=${RUN_IDX} (previous run failed)"\n')
-                out.write('        continue\n')
-                out.write('      fi\n')
-                out.write('      echo "Running formula=${formula}, mode=${mode}, run=${RUN_IDX}, host=$(hostname)"\n')
-                out.write('      python3 "${JOB_RUNNER:-./job_runner.py}" ')
-                out.write('--binary "${BINARY}" ')
-                out.write('--binary-args "${COMBINED_ARGS}" ')
-                out.write('--singularity "${SINGULARITY}" ')
-                out.write('--mode "${mode}" ')
-                out.write('--formula "${formula}" ')
-                out.write('--partition "${partition}" ')
-                out.write('--run-idx "${RUN_IDX}" ')
-                out.write('--out-dir "${OUT_DIR}" ')
-                out.write('--timeout "${TIMEOUT}"\n')
-                out.write('      exit_code=$?\n')
-                out.write('      if [ "$exit_code" -ne 0 ]; then\n')
-                out.write('        echo "Run failed with exit code ${exit_code}, skipping remaining runs and this mode for all future patterns"\n')
-                out.write('        skip_remaining_runs=1\n')
-                out.write('        skip_mode[$mode]=1\n')
-                out.write('      fi\n')
-                out.write('    done\n')
-                out.write('  done\n')
-                out.write('done\n')
-
-            os.chmod(job_script, 0o755)
-            return job_script
+                    if m == 'el':
+                        mode_args = '-s 0 -g 0 --obligation-simplification 0'
+                    else:
+                        mode_args = f'-s 0 -g 1 --obligation-simplification 1 -b {m}'
+                    task = {'formula': formula, 'partition': partition, 'mode': m, 'binary_args': mode_args}
+                    if shard:
+                        task['out_dir'] = f"{out_dir / 'results'}/{m}/{Path(p).stem}"
+                    for r in range(1, runs + 1):
+                        task['run_idx'] = r
+                        buf.write(json.dumps(task) + '\n')
+            buf.write('TASKS\n')
+
+            return _write_script(job_script, buf.getvalue(), inline)
 
         # Build and submit the global job script
-        global_script = write_global_job_script(run_out_dir, [str(p) for p in examples], modes, args.binary, args.singularity, args.binary_args, args.timeout, args.runs, sbatch_opts)
+        global_script = write_global_job_script(run_out_dir, [str(p) for p, _ in examples], modes, args.binary, args.singularity, args.binary_args, args.timeout, args.runs, sbatch_opts,
+                                                 ndjson=args.ndjson, inline=args.inline_submit, shard=args.shard_results)
         jobid = submit_script(
             global_script,
             retries=args.sbatch_retries,
@@ -483,40 +1007,78 @@ def main():
         )
         submitted.append(jobid)
         expected_runs = len(examples) * len(modes) * args.runs
+    elif args.single_array:
+        patterns = []
+        for pattern, partition_file in examples:
+            if partition_file is None:
+                print(f"Skipping {pattern.name}: partition file not found: {pattern.with_suffix('.part')}")
+                continue
+            patterns.append((pattern, partition_file))
+        array_script = write_array_job_script(run_out_dir, patterns, modes, args.binary, args.singularity, args.binary_args, args.timeout, args.runs, sbatch_opts,
+                                              array_throttle=args.array_throttle, ndjson=args.ndjson,
+                                              inline=args.inline_submit, shard=args.shard_results)
+        jobid = submit_script(
+            array_script,
+            retries=args.sbatch_retries,
+            retry_delay=args.sbatch_retry_delay,
+            retry_backoff=args.sbatch_retry_backoff,
+        )
+        submitted.append(jobid)
+        expected_runs = len(patterns) * len(modes) * args.runs
     else:
-        for pattern in examples:
-            partition_file = pattern.with_suffix('.part')
-            if not partition_file.exists():
-                print(f"Skipping {pattern.name}: partition file not found: {partition_file}")
+        tasks = []
+        for pattern, partition_file in examples:
+            if partition_file is None:
+                print(f"Skipping {pattern.name}: partition file not found: {pattern.with_suffix('.part')}")
                 continue
             for mode in modes:
-                job_script = write_job_script(
-                    run_out_dir,
-                    pattern,
-                    partition_file,
-                    args.binary,
-                    args.singularity,
-                    args.binary_args,
-                    args.timeout,
-                    args.runs,
-                    sbatch_opts,
-                    mode,
-                    single_node=args.single_node,
-                )
-                jobid = submit_script(
-                    job_script,
-                    retries=args.sbatch_retries,
-                    retry_delay=args.sbatch_retry_delay,
-                    retry_backoff=args.sbatch_retry_backoff,
-                )
-                submitted.append(jobid)
+                tasks.append((pattern, partition_file, mode))
                 expected_runs += args.runs
 
+        submit = functools.partial(
+            submit_script,
+            retries=args.sbatch_retries,
+            retry_delay=args.sbatch_retry_delay,
+            retry_backoff=args.sbatch_retry_backoff,
+        )
+
+        def write_and_submit(task):
+            pattern, partition_file, mode = task
+            job_script = write_job_script(
+                run_out_dir,
+                pattern,
+                partition_file,
+                args.binary,
+                args.singularity,
+                args.binary_args,
+                args.timeout,
+                args.runs,
+                sbatch_opts,
+                mode,
+                single_node=args.single_node,
+                array_throttle=args.array_throttle,
+                ndjson=args.ndjson,
+                inline=args.inline_submit,
+                shard=args.shard_results,
+            )
+            return submit(job_script)
+
+        if args.serial_submit or len(tasks) <= 1:
+            submitted.extend(map(write_and_submit, tasks))
+        else:
+            # Writing a script (shared filesystem) and sbatch (controller) both mostly
+            # wait, so a few are in flight at once; job ids come back in task order.
+            # The runner is copied up front so the workers do not race on it.
+            install_job_runner(run_out_dir / 'jobs')
+            with ThreadPoolExecutor(max_workers=min(SUBMIT_WORKERS, len(tasks))) as ex:
+                submitted.extend(ex.map(write_and_submit, tasks))
+
     print(f"Submitted {len(submitted)} jobs ({expected_runs} runs total)")
 
     if args.wait:
         print('Waiting for results to appear...')
-        ok = wait_for_results(run_out_dir, expected_runs, timeout_s=max(3600, args.runs * len(examples) * args.timeout * 2))
+        ok = wait_for_results(run_out_dir, expected_runs, timeout_s=max(3600, args.runs * len(examples) * args.timeout * 2),
+                              poll_interval=args.poll_interval, job_ids=submitted, max_poll_interval=args.poll_max_interval)
         if not ok:
             print('Timeout while waiting for results. Some runs may be missing.')
         else:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for submit_bench.py, run against a fake `sbatch` on PATH.
+
+Usage:
+    python3 -m pytest scripts/slurm_benchmark/test_submit_bench.py
+    python3 scripts/slurm_benchmark/test_submit_bench.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SUBMIT_BENCH = Path(__file__).resolve().parent / 'submit_bench.py'
+
+FAKE_SBATCH = '#!/bin/sh\ncat > /dev/null\necho "Submitted batch job 42"\n'
+
+
+class SingleJobTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        bin_dir = self.tmp / 'bin'
+        bin_dir.mkdir()
+        sbatch = bin_dir / 'sbatch'
+        sbatch.write_text(FAKE_SBATCH)
+        sbatch.chmod(0o755)
+        self.env = dict(os.environ, PATH=f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        self.examples = self.tmp / 'examples' / 'frompaper'
+        self.examples.mkdir(parents=True)
+        for n in (1, 2):
+            (self.examples / f'pattern_{n}.ltlfplus').write_text('E(F(p))\n')
+            (self.examples / f'pattern_{n}.part').write_text('.inputs: p\n.outputs: q\n')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def submit(self, *extra):
+        out_dir = self.tmp / 'out'
+        result = subprocess.run(
+            [sys.executable, str(SUBMIT_BENCH),
+             '--examples-dir', str(self.examples),
+             '--out-dir', str(out_dir),
+             '--run-name', 'test',
+             '--runs', '2',
+             '--modes', 'el,wg',
+             '--single-job', *extra],
+            cwd=self.tmp, env=self.env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        script = out_dir / 'test' / 'jobs' / 'job_all_patterns.sh'
+        self.assertTrue(script.exists(), result.stdout + result.stderr)
+        return script.read_text()
+
+    def tasks(self, script):
+        body = script.split("<<'TASKS'\n", 1)[1].split('TASKS\n', 1)[0]
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_single_job_tasks(self):
+        tasks = self.tasks(self.submit())
+        self.assertEqual(len(tasks), 2 * 2 * 2)
+        self.assertEqual(tasks[0]['formula'], str(self.examples / 'pattern_1.ltlfplus'))
+        self.assertEqual(tasks[0]['partition'], str(self.examples / 'pattern_1.part'))
+
+    def test_single_job_with_singularity(self):
+        tasks = self.tasks(self.submit('--singularity', str(self.tmp / 'image.sif')))
+        self.assertEqual(len(tasks), 2 * 2 * 2)
+        self.assertEqual(tasks[0]['formula'], '/opt/examples/frompaper/pattern_1.ltlfplus')
+        self.assertEqual(tasks[0]['partition'], '/opt/examples/frompaper/pattern_1.part')
+        self.assertEqual([t['mode'] for t in tasks[:4]], ['el', 'el', 'wg', 'wg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,102 +6,120 @@ and compares results between normal solver and obligation simplification.
 
 import subprocess
 import random
+import re
 import sys
 import tempfile
 import os
 import argparse
 import time
-import curses
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Atomic propositions to use
 ATOMS = ['p', 'q', 'r', 's', 't']
 
-def random_ltlf_formula(depth=3, atoms=None):
-    """Generate a random LTLf formula."""
-    if atoms is None:
-        atoms = ATOMS[:3]  # Use first 3 atoms by default
-    
-    if depth <= 0 or random.random() < 0.3:
+# Verdicts in the solver output, matched case-insensitively without an upper-cased copy
+UNREALIZABLE_RE = re.compile(b'UNREALIZABLE', re.IGNORECASE)
+REALIZABLE_RE = re.compile(b'REALIZABLE', re.IGNORECASE)
+
+# Operators of random_ltlf_formula as (prefix, infix) tokens, in the order they are
+# drawn: unary operators are written PREFIX sub), binary ones (left INFIX right)
+LTLF_OPERATORS = (
+    (None, ' & '),   # and
+    (None, ' | '),   # or
+    ('X(', None),
+    ('F(', None),
+    ('G(', None),
+    (None, ' U '),
+    (None, ' -> '),  # impl
+)
+
+def _emit_ltlf(out, depth, atoms, rng):
+    """Append the tokens of a random LTLf formula to `out` (see random_ltlf_formula)."""
+    if depth <= 0 or rng.random() < 0.3:
         # Base case: atomic proposition or its negation
-        atom = random.choice(atoms)
-        if random.random() < 0.3:
-            return f"!{atom}"
-        return atom
+        atom = rng.choice(atoms)
+        if rng.random() < 0.3:
+            out.append('!')
+        out.append(atom)
+        return
     
     # Recursive case: choose an operator
-    op = random.choice(['and', 'or', 'X', 'F', 'G', 'U', 'impl'])
+    prefix, infix = rng.choice(LTLF_OPERATORS)
     
-    if op == 'and':
-        left = random_ltlf_formula(depth - 1, atoms)
-        right = random_ltlf_formula(depth - 1, atoms)
-        return f"({left} & {right})"
-    elif op == 'or':
-        left = random_ltlf_formula(depth - 1, atoms)
-        right = random_ltlf_formula(depth - 1, atoms)
-        return f"({left} | {right})"
-    elif op == 'X':
-        sub = random_ltlf_formula(depth - 1, atoms)
-        return f"X({sub})"
-    elif op == 'F':
-        sub = random_ltlf_formula(depth - 1, atoms)
-        return f"F({sub})"
-    elif op == 'G':
-        sub = random_ltlf_formula(depth - 1, atoms)
-        return f"G({sub})"
-    elif op == 'U':
-        left = random_ltlf_formula(depth - 1, atoms)
-        right = random_ltlf_formula(depth - 1, atoms)
-        return f"({left} U {right})"
-    elif op == 'impl':
-        left = random_ltlf_formula(depth - 1, atoms)
-        right = random_ltlf_formula(depth - 1, atoms)
-        return f"({left} -> {right})"
-    
-    return random.choice(atoms)
+    if prefix:
+        out.append(prefix)
+        _emit_ltlf(out, depth - 1, atoms, rng)
+        out.append(')')
+    else:
+        out.append('(')
+        _emit_ltlf(out, depth - 1, atoms, rng)
+        out.append(infix)
+        _emit_ltlf(out, depth - 1, atoms, rng)
+        out.append(')')
 
-def random_obligation_formula(num_conjuncts=2, depth=2, atoms=None):
+def random_ltlf_formula(depth=3, atoms=None, rng=None):
+    """Generate a random LTLf formula, drawing from `rng` (default: the random module)."""
+    if rng is None:
+        rng = random
+    if atoms is None:
+        atoms = ATOMS[:3]  # Use first 3 atoms by default
+    # the tokens are joined once, instead of copying every subformula into its parent
+    out = []
+    _emit_ltlf(out, depth, atoms, rng)
+    return ''.join(out)
+
+def random_obligation_formula(num_conjuncts=2, depth=2, atoms=None, rng=None):
     """
     Generate a random LTLf+ formula in the obligation fragment.
     Obligation fragment consists of positive boolean combinations of:
     - A(phi) - Forall quantifier (safety-like)
     - E(phi) - Exists quantifier (guarantee-like)
-    where phi is an LTLf formula.
+    where phi is an LTLf formula. Draws from `rng` (default: the random module).
     """
+    if rng is None:
+        rng = random
     if atoms is None:
         atoms = ATOMS[:3]
     
+    out = []
+
     def random_obligation_subformula(d):
-        if d <= 0 or random.random() < 0.4:
-            # Base case: A(phi) or E(phi)
-            inner = random_ltlf_formula(depth, atoms)
-            if random.random() < 0.5:
-                return f"A({inner})"
-            else:
-                return f"E({inner})"
+        if d <= 0 or rng.random() < 0.4:
+            # Base case: A(phi) or E(phi); phi is generated before the quantifier is drawn
+            slot = len(out)
+            out.append(None)
+            _emit_ltlf(out, depth, atoms, rng)
+            out[slot] = 'A(' if rng.random() < 0.5 else 'E('
+            out.append(')')
+            return
         
         # Recursive case: conjunction or disjunction (positive boolean combination)
-        op = random.choice(['and', 'or'])
-        left = random_obligation_subformula(d - 1)
-        right = random_obligation_subformula(d - 1)
-        
-        if op == 'and':
-            return f"({left} & {right})"
-        else:
-            return f"({left} | {right})"
+        op = rng.choice(['and', 'or'])
+        out.append('(')
+        random_obligation_subformula(d - 1)
+        out.append(' & ' if op == 'and' else ' | ')
+        random_obligation_subformula(d - 1)
+        out.append(')')
     
-    return random_obligation_subformula(num_conjuncts)
+    random_obligation_subformula(num_conjuncts)
+    return ''.join(out)
 
-def random_partition(atoms):
+def random_partition(atoms, rng=None):
     """Generate a random partition of atoms into inputs and outputs."""
+    if rng is None:
+        rng = random
     atoms = list(atoms)
-    random.shuffle(atoms)
+    rng.shuffle(atoms)
     
     # Ensure at least one input and one output
     if len(atoms) < 2:
         return atoms, []
     
-    split = random.randint(1, len(atoms) - 1)
+    split = rng.randint(1, len(atoms) - 1)
     inputs = atoms[:split]
     outputs = atoms[split:]
     
@@ -112,16 +130,50 @@ def write_formula_file(formula, filepath):
     with open(filepath, 'w') as f:
         f.write(formula + "\n")
 
-def write_partition_file(inputs, outputs, filepath):
-    """Write partition to a .part file."""
+def partition_text(inputs, outputs):
+    """Return the contents of a .part file for the given partition."""
+    return ".inputs: " + " ".join(inputs) + "\n.outputs: " + " ".join(outputs) + "\n"
+
+def write_partition_file(inputs, outputs, filepath, text=None):
+    """Write partition to a .part file (`text`: its partition_text(), if already built)."""
     with open(filepath, 'w') as f:
-        f.write(".inputs: " + " ".join(inputs) + "\n")
-        f.write(".outputs: " + " ".join(outputs) + "\n")
+        f.write(text or partition_text(inputs, outputs))
 
-def run_solver(binary_path, formula_file, partition_file, obligation_simplification, solver_id="0", timeout=60):
-    """Run the solver and return (status, realizable, output).
+class CoreAllocator:
+    """Pins solver processes to CPUs of this process's affinity mask, one solver per CPU.
 
-    status ∈ {"ok", "timeout", "error"}.
+    Solvers started while every CPU is taken are left unpinned.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.free = sorted(os.sched_getaffinity(0))
+
+    def pin(self, pid):
+        """Pin `pid` to a free CPU and return it, or None if none is free."""
+        with self.lock:
+            if not self.free:
+                return None
+            core = self.free.pop(0)
+        try:
+            os.sched_setaffinity(pid, {core})
+        except OSError:
+            # e.g. the solver already exited
+            self.release(core)
+            return None
+        return core
+
+    def release(self, core):
+        if core is not None:
+            with self.lock:
+                self.free.append(core)
+
+def start_solver(binary_path, formula_file, partition_file, obligation_simplification, solver_id="0", cores=None):
+    """Start the solver without waiting for it; see finish_solver().
+
+    Its stdout and stderr go to temporary files rather than pipes, so nothing has to
+    drain them while it runs and a large log does not sit in memory. With a
+    CoreAllocator, the solver is pinned to a CPU of its own until it finishes.
     """
     cmd = [
         binary_path,
@@ -131,56 +183,256 @@ def run_solver(binary_path, formula_file, partition_file, obligation_simplificat
         "-g", solver_id,  # solver
         "--obligation-simplification", str(obligation_simplification)
     ]
-    
+    stdout_file = tempfile.TemporaryFile()
+    stderr_file = tempfile.TemporaryFile()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        output = result.stdout + result.stderr
-        
-        # Parse realizability from output
-        realizable = None
-        if "REALIZABLE" in output.upper():
-            if "UNREALIZABLE" in output.upper():
-                realizable = False
-            else:
-                realizable = True
-        
-        return "ok", realizable, output
-    
-    except subprocess.TimeoutExpired:
-        return "timeout", None, "TIMEOUT"
+        proc = subprocess.Popen(cmd, stdout=stdout_file, stderr=stderr_file)
+    except Exception:
+        stdout_file.close()
+        stderr_file.close()
+        raise
+    proc.output_files = (stdout_file, stderr_file)
+    proc.cores = cores
+    proc.core = cores.pin(proc.pid) if cores is not None else None
+    return proc
+
+DFA_DUMP_BEGIN = b'===PYDFA_BEGIN==='
+DFA_DUMP_END = b'===PYDFA_END==='
+
+def read_solver_output(files, max_output=None, keep_dump=True):
+    """Return (realizable, output) from the solver's stdout and stderr files.
+
+    The verdict is searched in all of the output (UNREALIZABLE anywhere takes
+    precedence). Text outside the ===PYDFA_BEGIN===...===PYDFA_END=== dump is
+    capped at `max_output` bytes (all if None); the dump itself is always kept
+    in full when `keep_dump` is set, since the mismatch visualization needs it.
+    """
+    unrealizable = realizable = False
+    kept = []
+    size = 0  # bytes outside the dump
+    overlap = len(b'UNREALIZABLE') - 1  # a verdict may straddle two chunks
+
+    def keep_text(piece):
+        nonlocal size
+        if max_output is None:
+            kept.append(piece)
+        elif size < max_output:
+            kept.append(piece[:max_output - size])
+        size += len(piece)
+
+    for f in files:
+        f.seek(0)
+        tail = b''
+        pending = b''  # held back in case a dump marker straddles two chunks
+        in_dump = False
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            window = tail + chunk
+            unrealizable = unrealizable or UNREALIZABLE_RE.search(window) is not None
+            realizable = realizable or REALIZABLE_RE.search(window) is not None
+            tail = window[-overlap:]
+            if not keep_dump:
+                keep_text(chunk)
+                continue
+            data = pending + chunk
+            while True:
+                marker = DFA_DUMP_END if in_dump else DFA_DUMP_BEGIN
+                idx = data.find(marker)
+                if idx < 0:
+                    split = max(len(data) - (len(marker) - 1), 0)
+                    if in_dump:
+                        kept.append(data[:split])
+                    else:
+                        keep_text(data[:split])
+                    pending = data[split:]
+                    break
+                if in_dump:
+                    kept.append(data[:idx + len(marker)])
+                    data = data[idx + len(marker):]
+                else:
+                    keep_text(data[:idx])
+                    data = data[idx:]
+                    kept.append(data[:len(marker)])
+                    data = data[len(marker):]
+                in_dump = not in_dump
+        if in_dump:
+            kept.append(pending)
+        else:
+            keep_text(pending)
+    output = b''.join(kept).decode('utf-8', errors='replace')
+    if max_output is not None and size > max_output and max_output > 0:
+        output += f"\n[output truncated: {size} bytes outside the DFA dump, first {max_output} kept]\n"
+    if unrealizable:
+        return False, output
+    if realizable:
+        return True, output
+    return None, output
+
+def finish_solver(proc, timeout=60, max_output=None, keep_dump=True):
+    """Wait for a solver started by start_solver() and return (status, realizable, output).
+
+    status ∈ {"ok", "timeout", "error"}. At most `max_output` bytes of the output
+    outside the DFA dump are returned (see read_solver_output()).
+    """
+    # Kill the solver from a timer: Popen.wait(timeout=...) polls with growing
+    # sleeps, which would delay noticing that the solver has finished.
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    try:
+        try:
+            proc.wait()
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            return "timeout", None, "TIMEOUT"
+        realizable, output = read_solver_output(proc.output_files, max_output, keep_dump)
+    except Exception as e:
+        return "error", None, str(e)
+    finally:
+        for f in proc.output_files:
+            f.close()
+        if proc.cores is not None:
+            proc.cores.release(proc.core)
+    return "ok", realizable, output
+
+def run_solver(binary_path, formula_file, partition_file, obligation_simplification, solver_id="0", timeout=60, max_output=None, cores=None):
+    """Run the solver and return (status, realizable, output).
+
+    status ∈ {"ok", "timeout", "error"}.
+    """
+    try:
+        proc = start_solver(binary_path, formula_file, partition_file, obligation_simplification, solver_id, cores)
     except Exception as e:
         return "error", None, str(e)
+    return finish_solver(proc, timeout, max_output)
+
+class SolverCache:
+    """Persistent (sqlite) cache of solver results, shared by all test threads.
+
+    Keys cover the binary (path, size and mtime, so a rebuild invalidates them),
+    the formula, the partition, the solver id, the obligation flag and the
+    output cap the stored output was read with. Only completed runs are
+    stored; timeouts depend on --timeout and are rerun.
+    """
 
-def test_single_formula(binary_path, formula, inputs, outputs, verbose=False, timeout=60):
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS results '
+                        '(key TEXT PRIMARY KEY, status TEXT, realizable INTEGER, output TEXT)')
+        self.db.commit()
+
+    @staticmethod
+    def key(binary_path, formula, inputs, outputs, obligation_simplification, solver_id, max_output=None):
+        st = os.stat(binary_path)
+        text = '|'.join([os.path.abspath(binary_path), str(st.st_size), str(st.st_mtime_ns),
+                         formula, ' '.join(inputs), ' '.join(outputs),
+                         str(solver_id), str(obligation_simplification),
+                         f'max_output={max_output}'])
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute(
+                'SELECT status, realizable, output FROM results WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, realizable, output = row
+        return status, None if realizable is None else bool(realizable), output
+
+    def put(self, key, result):
+        status, realizable, output = result
+        with self.lock:
+            self.db.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                (key, status, None if realizable is None else int(realizable), output)
+            )
+            self.db.commit()
+
+def test_single_formula(binary_path, formula, inputs, outputs, verbose=False, timeout=60, cache=None, max_output=None, cores=None):
     """Test a single formula with the obligation simplifier and baseline solvers g=0,1,2.
-    A mismatch is recorded only if all three baseline solvers disagree with the obligation result.
+    A mismatch is recorded only if all three baseline solvers disagree with the obligation result,
+    so baselines still running once one of them agrees are killed (listed in 'cancelled_baselines').
+    With a SolverCache, runs whose results are cached are not started again.
+    Only the verdicts of the baselines are kept, and at most `max_output` bytes of
+    the obligation solver's output.
     """
     with tempfile.TemporaryDirectory() as tmpdir:
         formula_file = os.path.join(tmpdir, "test.ltlfplus")
         partition_file = os.path.join(tmpdir, "test.part")
         
         write_formula_file(formula, formula_file)
-        write_partition_file(inputs, outputs, partition_file)
+        part_text = partition_text(inputs, outputs)
+        write_partition_file(inputs, outputs, partition_file, part_text)
         
-        # Run obligation simplification solver (game-solver always 1)
-        status_oblig, realizable_oblig, output_oblig = run_solver(
-            binary_path, formula_file, partition_file, 1, solver_id="1", timeout=timeout
-        )
+        # The four solver runs only read the two input files, so run them side by side.
+        # As soon as one baseline agrees with the obligation solver the other baselines
+        # cannot change the outcome, so they are killed and reported as "cancelled".
+        procs = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {}
+            # Run obligation simplification solver (game-solver always 1), then the
+            # baseline solvers g=0,1,2 without obligation simplification
+            cache_keys = {}
+            for key, flag, gid in [("oblig", 1, "1"), ("0", 0, "0"), ("1", 0, "1"), ("2", 0, "2")]:
+                cached = None
+                # Baselines only need their verdict, so no output is kept for them
+                key_max_output = max_output if key == "oblig" else 0
+                if cache is not None:
+                    try:
+                        cache_keys[key] = cache.key(binary_path, formula, inputs, outputs, flag, gid, key_max_output)
+                    except OSError:
+                        pass  # e.g. missing binary; the run below reports the error
+                    else:
+                        cached = cache.get(cache_keys[key])
+                try:
+                    if cached is not None:
+                        future = Future()
+                        future.set_result(cached)
+                    else:
+                        procs[key] = start_solver(binary_path, formula_file, partition_file, flag, solver_id=gid, cores=cores)
+                        future = executor.submit(
+                            finish_solver, procs[key], timeout, key_max_output, key == "oblig"
+                        )
+                except Exception as e:
+                    future = Future()
+                    future.set_result(("error", None, str(e)))
+                futures[future] = key
 
-        # Run baseline solvers g=0,1,2 without obligation simplification
-        baseline_results = []
-        for gid in ["0", "1", "2"]:
-            status, realizable, output = run_solver(
-                binary_path, formula_file, partition_file, 0, solver_id=gid, timeout=timeout
-            )
-            baseline_results.append((gid, status, realizable, output))
-        
+            finished = {}
+            cancelled = []
+            for future in as_completed(futures):
+                finished[futures[future]] = future.result()
+                status_oblig, realizable_oblig, _ = finished.get("oblig", (None, None, None))
+                if status_oblig != "ok" or realizable_oblig is None:
+                    continue
+                if any(st == "ok" and rea == realizable_oblig
+                       for key, (st, rea, _) in finished.items() if key != "oblig"):
+                    for other, key in futures.items():
+                        if other.done():
+                            finished[key] = other.result()
+                    cancelled = [key for key in ["0", "1", "2"] if key not in finished]
+                    for key in cancelled:
+                        procs[key].kill()
+                    break
+
+        if cache is not None:
+            for key, result in finished.items():
+                if key in procs and key in cache_keys and result[0] == "ok":
+                    cache.put(cache_keys[key], result)
+
+        status_oblig, realizable_oblig, output_oblig = finished["oblig"]
+        baseline_results = [
+            (gid, "cancelled", None, "CANCELLED") if gid in cancelled else (gid, *finished[gid])
+            for gid in ["0", "1", "2"]
+        ]
         if verbose:
             print(f"  Formula: {formula}")
             print(f"  Inputs: {inputs}, Outputs: {outputs}")
@@ -205,9 +457,11 @@ def test_single_formula(binary_path, formula, inputs, outputs, verbose=False, ti
                 'formula': formula,
                 'inputs': inputs,
                 'outputs': outputs,
+                'partition_text': part_text,
                 'status_oblig': status_oblig,
                 'realizable_oblig': realizable_oblig,
                 'baseline': baseline_results,
+                'cancelled_baselines': cancelled,
                 'output_oblig': output_oblig if status_oblig != "ok" else None,
                 'agree': None,
                 'error': True,
@@ -219,9 +473,11 @@ def test_single_formula(binary_path, formula, inputs, outputs, verbose=False, ti
                 'formula': formula,
                 'inputs': inputs,
                 'outputs': outputs,
+                'partition_text': part_text,
                 'status_oblig': status_oblig,
                 'realizable_oblig': realizable_oblig,
                 'baseline': baseline_results,
+                'cancelled_baselines': cancelled,
                 'output_oblig': output_oblig if status_oblig != "ok" else None,
                 'agree': None,
                 'error': False,
@@ -238,10 +494,12 @@ def test_single_formula(binary_path, formula, inputs, outputs, verbose=False, ti
             'formula': formula,
             'inputs': inputs,
             'outputs': outputs,
+            'partition_text': part_text,
             'status_oblig': status_oblig,
             'realizable_oblig': realizable_oblig,
             'output_oblig': output_oblig,
             'baseline': baseline_results,
+            'cancelled_baselines': cancelled,
             'agree': agree,
             'error': False,
             'timeout': False
@@ -310,7 +568,7 @@ def main():
     parser.add_argument(
         '--live',
         action='store_true',
-        help='Show live failure percentage/progress using curses'
+        help='Show live failure percentage/progress, redrawn in place'
     )
     parser.add_argument(
         '--timeout',
@@ -330,14 +588,49 @@ def main():
         action='store_false',
         help='Skip the existing mismatch check'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // 4),
+        help='Number of tests to run in parallel, each running its 4 solvers at once '
+             '(default: number of CPUs / 4; use 1 for readable --verbose output)'
+    )
+    parser.add_argument(
+        '--cache',
+        nargs='?',
+        const='.obligation_test_cache.sqlite',
+        default=None,
+        metavar='PATH',
+        help='Reuse solver results from earlier runs of the same binary, stored in PATH '
+             '(default: .obligation_test_cache.sqlite)'
+    )
+    parser.add_argument(
+        '--max-output-bytes',
+        type=int,
+        default=None,
+        help='Keep at most this many bytes of the obligation solver output per test, not counting the PYDFA dump, which is always kept (default: all)'
+    )
+    parser.add_argument(
+        '--affinity',
+        action='store_true',
+        help='Pin each running solver to a CPU of its own (Linux only)'
+    )
     parser.set_defaults(check_mismatches=True)
     
     args = parser.parse_args()
     
-    if args.seed is not None:
-        random.seed(args.seed)
+    # One generator for all random tests and the runtime benchmark; Random(seed)
+    # draws the same sequence as seeding the random module did before.
+    rng = random.Random(args.seed)
     
     atoms = ATOMS[:args.num_atoms]
+    cache = SolverCache(args.cache) if args.cache else None
+    cores = None
+    if args.affinity:
+        if hasattr(os, 'sched_setaffinity'):
+            cores = CoreAllocator()
+        else:
+            print('--affinity is not supported on this platform; solvers are not pinned')
     mismatch_dir = Path(args.binary).parent.parent.parent / 'examples' / 'mismatches'
     mismatch_dir.mkdir(parents=True, exist_ok=True)
 
@@ -376,38 +669,56 @@ def main():
         still_disagree = []
         resolved = []
 
+        # Read the mismatches up to the first one without a partition, which aborts the check
+        cases = []
+        missing_label = None
         for formula_path in mismatch_files:
             idx = mismatch_index_from_path(formula_path)
             part_path = formula_path.with_suffix('.part')
             label = f" mismatch {idx}" if idx is not None else f" {formula_path.stem}"
 
             if not part_path.exists():
-                print(f"  Missing partition for{label}; aborting")
-                return False
+                missing_label = label
+                break
 
             formula = formula_path.read_text().strip()
             inputs, outputs = parse_partition_file(part_path)
+            cases.append((label, formula, inputs, outputs))
 
-            result = test_single_formula(
-                args.binary,
-                formula,
-                inputs,
-                outputs,
-                args.verbose,
-                timeout=args.timeout
+        # Run them like the random tests, --jobs at a time, and check the results in order;
+        # tests not started yet are cancelled if an earlier one aborts the check
+        executor = ThreadPoolExecutor(max_workers=max(1, args.jobs))
+        try:
+            results = executor.map(
+                lambda c: test_single_formula(
+                    args.binary,
+                    *c[1:],
+                    args.verbose,
+                    timeout=args.timeout,
+                    cache=cache,
+                    max_output=args.max_output_bytes,
+                    cores=cores
+                ),
+                cases
             )
+            for (label, _, _, _), result in zip(cases, results):
+                if result['error']:
+                    print(f"  Existing mismatch{label} triggers an error")
+                    return False
+                if result.get('timeout'):
+                    timeouts = ', '.join(result.get('timeout_solvers', [])) or 'unknown solver'
+                    print(f"  Existing mismatch{label} timed out ({timeouts})")
+                    return False
+                if result['agree']:
+                    resolved.append(label.strip())
+                else:
+                    still_disagree.append(label.strip())
+        finally:
+            executor.shutdown(cancel_futures=True)
 
-            if result['error']:
-                print(f"  Existing mismatch{label} triggers an error")
-                return False
-            if result.get('timeout'):
-                timeouts = ', '.join(result.get('timeout_solvers', [])) or 'unknown solver'
-                print(f"  Existing mismatch{label} timed out ({timeouts})")
-                return False
-            if result['agree']:
-                resolved.append(label.strip())
-            else:
-                still_disagree.append(label.strip())
+        if missing_label is not None:
+            print(f"  Missing partition for{missing_label}; aborting")
+            return False
 
         if still_disagree:
             print('Existing mismatches still disagree: ' + ', '.join(still_disagree))
@@ -433,44 +744,91 @@ def main():
         print(f"Conjuncts: {args.num_conjuncts}, Depth: {args.depth}")
         print()
     
+    # Generate all random formulas and partitions up front, in the same order as a
+    # sequential run, so a given --seed yields the same tests for any --jobs.
+    tests = []
+    for i in range(args.num_tests):
+        formula = random_obligation_formula(
+            num_conjuncts=args.num_conjuncts,
+            depth=args.depth,
+            atoms=atoms,
+            rng=rng
+        )
+        inputs, outputs = random_partition(atoms, rng)
+        tests.append((formula, inputs, outputs))
+
+    # Small --num-atoms/--depth settings often generate the same test more than once;
+    # run each distinct test once and reuse its result for the repeats.
+    unique_tests = []
+    unique_index = {}
+    test_slots = []
+    for formula, inputs, outputs in tests:
+        key = (formula, tuple(inputs), tuple(outputs))
+        if key not in unique_index:
+            unique_index[key] = len(unique_tests)
+            unique_tests.append((formula, inputs, outputs))
+        test_slots.append(unique_index[key])
+    if not args.shallow and len(unique_tests) < len(tests):
+        print(f"{len(tests) - len(unique_tests)} duplicate tests reuse earlier results "
+              f"({len(unique_tests)} distinct)")
+        print()
+
+    def iter_results(executor):
+        """Yield the test results in test order while up to --jobs tests run at once.
+        Each test mostly waits on its solver subprocesses, so threads are enough."""
+        pending = executor.map(
+            lambda t: test_single_formula(args.binary, *t, args.verbose, timeout=args.timeout, cache=cache,
+                                          max_output=args.max_output_bytes, cores=cores),
+            unique_tests
+        )
+        unique_results = []
+        for slot in test_slots:
+            # a test's first occurrence is never later than its repeats
+            while len(unique_results) <= slot:
+                unique_results.append(next(pending))
+            yield unique_results[slot]
+
     def run_tests_live():
-        def _runner(stdscr):
-            curses.curs_set(0)
-            stdscr.nodelay(False)
-            results = []
-            num_agree = num_disagree = num_error = num_timeout = 0
-            for i in range(args.num_tests):
-                formula = random_obligation_formula(
-                    num_conjuncts=args.num_conjuncts,
-                    depth=args.depth,
-                    atoms=atoms
-                )
-                inputs, outputs = random_partition(atoms)
-                result = test_single_formula(
-                    args.binary, formula, inputs, outputs, args.verbose, timeout=args.timeout
-                )
-                results.append(result)
-                if result['error']:
-                    num_error += 1
-                elif result.get('timeout'):
-                    num_timeout += 1
-                elif result['agree']:
-                    num_agree += 1
-                else:
-                    num_disagree += 1
-                done = i + 1
-                fail_rate = num_disagree / done * 100
-                stdscr.clear()
-                stdscr.addstr(0, 0, f"Test {done}/{args.num_tests}")
-                stdscr.addstr(1, 0, f"Agree: {num_agree}")
-                stdscr.addstr(2, 0, f"Disagree: {num_disagree}")
-                stdscr.addstr(3, 0, f"Timeouts: {num_timeout}")
-                stdscr.addstr(4, 0, f"Errors: {num_error}")
-                stdscr.addstr(5, 0, f"Failure rate: {fail_rate:.2f}%")
-                stdscr.addstr(7, 0, "Press Ctrl+C to abort")
-                stdscr.refresh()
-            return results, num_agree, num_disagree, num_error, num_timeout
-        return curses.wrapper(_runner)
+        """Run the tests, redrawing a progress summary in place with ANSI escapes
+        (home + clear to end of screen), at most every 0.1 s."""
+        out = sys.stdout
+        results = []
+        num_agree = num_disagree = num_error = num_timeout = 0
+        last_draw = 0.0
+        out.write('\x1b[?25l')  # hide the cursor
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+                for i, result in enumerate(iter_results(executor)):
+                    results.append(result)
+                    if result['error']:
+                        num_error += 1
+                    elif result.get('timeout'):
+                        num_timeout += 1
+                    elif result['agree']:
+                        num_agree += 1
+                    else:
+                        num_disagree += 1
+                    done = i + 1
+                    now = time.monotonic()
+                    if done < args.num_tests and now - last_draw < 0.1:
+                        continue
+                    last_draw = now
+                    fail_rate = num_disagree / done * 100
+                    out.write(
+                        f"\x1b[H\x1b[JTest {done}/{args.num_tests}\n"
+                        f"Agree: {num_agree}\n"
+                        f"Disagree: {num_disagree}\n"
+                        f"Timeouts: {num_timeout}\n"
+                        f"Errors: {num_error}\n"
+                        f"Failure rate: {fail_rate:.2f}%\n"
+                        "\n"
+                        "Press Ctrl+C to abort\n"
+                    )
+                    out.flush()
+        finally:
+            out.write('\x1b[?25h')  # show the cursor again
+            out.flush()
+        return results, num_agree, num_disagree, num_error, num_timeout
     
     if args.live:
         results, num_agree, num_disagree, num_error, num_timeout = run_tests_live()
@@ -481,54 +839,42 @@ def main():
         num_error = 0
         num_timeout = 0
         
-        for i in range(args.num_tests):
-            if not args.shallow:
-                print(f"Test {i+1}/{args.num_tests}...", end=" ", flush=True)
-            
-            # Generate random formula and partition
-            formula = random_obligation_formula(
-                num_conjuncts=args.num_conjuncts,
-                depth=args.depth,
-                atoms=atoms
-            )
-            inputs, outputs = random_partition(atoms)
-            
-            # Run test
-            result = test_single_formula(
-                args.binary, formula, inputs, outputs, args.verbose, timeout=args.timeout
-            )
-            results.append(result)
-            
-            if result['error']:
-                if not args.shallow:
-                    print("ERROR")
-                num_error += 1
-            elif result.get('timeout'):
-                if not args.shallow:
-                    print("TIMEOUT")
-                num_timeout += 1
-            elif result['agree']:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            for i, result in enumerate(iter_results(executor)):
+                formula, inputs, outputs = tests[i]
                 if not args.shallow:
-                    # Obligation result equals at least one baseline; show that realizability
-                    print(f"AGREE (realizable_oblig={result['realizable_oblig']})")
-                num_agree += 1
-            else:
-                if not args.shallow:
-                    print(f"DISAGREE! oblig={result['realizable_oblig']} vs baselines {[b[2] for b in result['baseline']]}")
-                    print(f"  Formula: {formula}")
-                    print(f"  Inputs: {inputs}, Outputs: {outputs}")
-                num_disagree += 1
+                    print(f"Test {i+1}/{args.num_tests}...", end=" ", flush=True)
+                results.append(result)
+            
+                if result['error']:
+                    if not args.shallow:
+                        print("ERROR")
+                    num_error += 1
+                elif result.get('timeout'):
+                    if not args.shallow:
+                        print("TIMEOUT")
+                    num_timeout += 1
+                elif result['agree']:
+                    if not args.shallow:
+                        # Obligation result equals at least one baseline; show that realizability
+                        print(f"AGREE (realizable_oblig={result['realizable_oblig']})")
+                    num_agree += 1
+                else:
+                    if not args.shallow:
+                        print(f"DISAGREE! oblig={result['realizable_oblig']} vs baselines {[b[2] for b in result['baseline']]}")
+                        print(f"  Formula: {formula}")
+                        print(f"  Inputs: {inputs}, Outputs: {outputs}")
+                    num_disagree += 1
     
     # Dump all mismatches to file, sorted by formula length
     disagreements = [r for r in results if not r['error'] and not r.get('timeout') and not r['agree']]
     disagreements.sort(key=lambda r: len(r['formula']))
-    with open('mismatch.txt', 'w') as f:
-        for r in disagreements:
-            f.write(f"Formula: {r['formula']}\n")
-            f.write(f".inputs: {' '.join(r['inputs'])}\n")
-            f.write(f".outputs: {' '.join(r['outputs'])}\n")
-            f.write(f"oblig={r['realizable_oblig']}, baselines={[b[2] for b in r['baseline']]}\n")
-            f.write("\n")
+    Path('mismatch.txt').write_text(''.join(
+        f"Formula: {r['formula']}\n"
+        + r['partition_text']
+        + f"oblig={r['realizable_oblig']}, baselines={[b[2] for b in r['baseline']]}\n\n"
+        for r in disagreements
+    ))
     
     # Dump to examples/mismatches folder
     # Path to visualize_dfa.py script
@@ -542,48 +888,60 @@ def main():
             existing_indices.append(idx)
     next_mismatch_index = max(existing_indices) + 1 if existing_indices else 0
 
-    for offset, r in enumerate(disagreements):
-        mismatch_idx = next_mismatch_index + offset
-        formula_file = mismatch_dir / f"mismatch{mismatch_idx}.ltlfplus"
-        part_file = mismatch_dir / f"mismatch{mismatch_idx}.part"
-        with open(formula_file, 'w') as f:
-            f.write(r['formula'] + "\n")
-        with open(part_file, 'w') as f:
-            f.write(f".inputs: {' '.join(r['inputs'])}\n")
-            f.write(f".outputs: {' '.join(r['outputs'])}\n")
-        
-        # Extract DFA dump from obligation solver output and generate PNG
-        oblig_output = r.get('output_oblig', '')
-        if '===PYDFA_BEGIN===' in oblig_output and '===PYDFA_END===' in oblig_output:
-            dfa_dump_file = mismatch_dir / f"mismatch{mismatch_idx}_dfa.txt"
-            png_file = mismatch_dir / f"mismatch{mismatch_idx}_dfa.png"
-            with open(dfa_dump_file, 'w') as f:
-                f.write(oblig_output)
-            try:
-                result = subprocess.run(
-                    ['python3', str(visualize_script), str(dfa_dump_file), '-o', str(png_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                # Check for weakness warning
-                if 'WARNING: DFA IS NOT WEAK' in result.stderr:
-                    r['not_weak'] = True
-                    print(f"  WARNING: mismatch{mismatch_idx} has non-weak DFA!")
-            except Exception as e:
-                pass  # Ignore visualization errors
-        else:
-            print("Cannot produce DFA visualization: DFA dump not found in output.")
-            print(oblig_output)
+    def visualize(dfa_dump, png_file):
+        """Render a DFA dump to png_file; return True if visualize_dfa.py reports a non-weak DFA."""
+        # -j 1: several of these already run side by side in the executor
+        try:
+            result = subprocess.run(
+                ['python3', str(visualize_script), '-j', '1', '-o', str(png_file)],
+                input=dfa_dump,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except Exception as e:
+            return False  # Ignore visualization errors
+        # Check for weakness warning
+        return 'WARNING: DFA IS NOT WEAK' in result.stderr
+
+    # The visualizations are independent subprocesses, so render them side by side
+    num_not_weak = 0
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        visualizations = []
+        for offset, r in enumerate(disagreements):
+            mismatch_idx = next_mismatch_index + offset
+            formula_file = mismatch_dir / f"mismatch{mismatch_idx}.ltlfplus"
+            part_file = mismatch_dir / f"mismatch{mismatch_idx}.part"
+            formula_file.write_text(r['formula'] + "\n")
+            part_file.write_text(r['partition_text'])
             
-            sys.exit(-1)
+            # Extract DFA dump from obligation solver output and generate PNG
+            oblig_output = r.get('output_oblig', '')
+            # Slice out the dump once; visualize_dfa.py reads just that slice from stdin
+            _, begin, rest = oblig_output.partition('===PYDFA_BEGIN===')
+            body, end, _ = rest.partition('===PYDFA_END===')
+            if begin and end:
+                dfa_dump_file = mismatch_dir / f"mismatch{mismatch_idx}_dfa.txt"
+                png_file = mismatch_dir / f"mismatch{mismatch_idx}_dfa.png"
+                with open(dfa_dump_file, 'w') as f:
+                    f.write(oblig_output)
+                future = executor.submit(visualize, begin + body + end + '\n', png_file)
+                visualizations.append((r, mismatch_idx, future))
+            else:
+                print("Cannot produce DFA visualization: DFA dump not found in output.")
+                print(oblig_output)
+                
+                sys.exit(-1)
+
+        for r, mismatch_idx, future in visualizations:
+            if future.result():
+                r['not_weak'] = True
+                num_not_weak += 1
+                print(f"  WARNING: mismatch{mismatch_idx} has non-weak DFA!")
 
     if disagreements:
         print(f"New mismatches start at index {next_mismatch_index}.")
     
-    # Count non-weak DFAs
-    num_not_weak = sum(1 for r in disagreements if r.get('not_weak', False))
-    
     if args.shallow:
         print(f"{num_disagree}")
         if num_not_weak > 0:
@@ -650,26 +1008,28 @@ def main():
         bench_fail = 0
         bench_timeouts = []
         bench_start = time.perf_counter()
-        for bench_idx in range(args.benchmark_runtime):
-            formula = random_obligation_formula(
-                num_conjuncts=harder_conj,
-                depth=harder_depth,
-                atoms=bench_atoms
-            )
-            inputs, outputs = random_partition(bench_atoms)
-            with tempfile.TemporaryDirectory() as tmpdir:
-                formula_file = os.path.join(tmpdir, "bench.ltlfplus")
-                part_file = os.path.join(tmpdir, "bench.part")
+        # One temp dir for the whole benchmark; the input files are rewritten for each instance
+        with tempfile.TemporaryDirectory() as tmpdir:
+            formula_file = os.path.join(tmpdir, "bench.ltlfplus")
+            part_file = os.path.join(tmpdir, "bench.part")
+            for bench_idx in range(args.benchmark_runtime):
+                formula = random_obligation_formula(
+                    num_conjuncts=harder_conj,
+                    depth=harder_depth,
+                    atoms=bench_atoms,
+                    rng=rng
+                )
+                inputs, outputs = random_partition(bench_atoms, rng)
                 write_formula_file(formula, formula_file)
                 write_partition_file(inputs, outputs, part_file)
 
                 # New (simplification on)
                 t0 = time.perf_counter()
-                status_new, _, _ = run_solver(args.binary, formula_file, part_file, 1, solver_id="0", timeout=args.timeout)
+                status_new, _, _ = run_solver(args.binary, formula_file, part_file, 1, solver_id="0", timeout=args.timeout, cores=cores)
                 t1 = time.perf_counter()
                 # Old (simplification off)
                 t2 = time.perf_counter()
-                status_old, _, _ = run_solver(args.binary, formula_file, part_file, 0, solver_id="0", timeout=args.timeout)
+                status_old, _, _ = run_solver(args.binary, formula_file, part_file, 0, solver_id="0", timeout=args.timeout, cores=cores)
                 t3 = time.perf_counter()
 
                 # Track timeouts and save them
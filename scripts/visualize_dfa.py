@@ -11,15 +11,20 @@ Usage:
 """
 
 import sys
+import io
 import json
-from collections import defaultdict
+import functools
+import hashlib
+import operator
+import os
+import pickle
+from collections import defaultdict, deque
 
 try:
-    from sympy import symbols, SOPform
-    HAS_SYMPY = True
+    import numpy as np
+    HAS_NUMPY = True
 except ImportError:
-    HAS_SYMPY = False
-    print("Warning: sympy not available, transition labels won't be minimized", file=sys.stderr)
+    HAS_NUMPY = False
 
 
 
@@ -129,8 +134,136 @@ def minterm_to_int(minterm):
     return result
 
 
-def build_explicit_dfa(dfa):
-    """Build explicit DFA from BDD minterms."""
+def _explicit_transitions_python(trans_funcs, num_state_bits, num_inputs, num_outputs):
+    """Group every (state, input, output) combination by its (state, next_state) edge."""
+    num_states = 1 << num_state_bits
+    num_in = 1 << num_inputs
+    num_out = 1 << num_outputs
+    
+    # Flat next-state table indexed by the packed (state, input, output);
+    # each minterm ORs its bit in, so no per-combination lookups are needed
+    next_states = [0] * (num_states * num_in * num_out)
+    for bit, minterms in trans_funcs.items():
+        if not 0 <= bit < num_state_bits:
+            continue
+        weight = 1 << bit
+        for state, inp, out in minterms:
+            if 0 <= state < num_states and 0 <= inp < num_in and 0 <= out < num_out:
+                next_states[(state * num_in + inp) * num_out + out] |= weight
+    
+    # Group by (state, next_state) -> list of (input, output) values
+    trans_by_edge = defaultdict(list)  # (state, next_state) -> [(input, output)]
+    
+    index = 0
+    for state in range(num_states):
+        for inp in range(num_in):
+            for out in range(num_out):
+                trans_by_edge[(state, next_states[index])].append((inp, out))
+                index += 1
+    
+    return trans_by_edge
+
+
+def _explicit_transitions_numpy(trans_funcs, num_state_bits, num_inputs, num_outputs):
+    """
+    Same result as _explicit_transitions_python, computed on a dense
+    (state, input, output) -> next_state array.
+
+    Each bit's minterms are packed into flat indices and OR their bit weight
+    into the array. Edges keep the order in which the nested loop
+    would first meet them, and each edge's (input, output) pairs stay in
+    (input, output) order.
+    """
+    num_states = 1 << num_state_bits
+    num_in = 1 << num_inputs
+    num_out = 1 << num_outputs
+    shape = (num_states, num_in, num_out)
+    
+    flat_next = np.zeros(num_states * num_in * num_out, dtype=np.int64)
+    for bit, minterms in trans_funcs.items():
+        if not minterms or not 0 <= bit < num_state_bits:
+            continue
+        sio = np.array(minterms, dtype=np.int64).reshape(-1, 3)
+        # Minterms outside the state/input/output space never matched before
+        valid = ((sio >= 0) & (sio < shape)).all(axis=1)
+        sio = sio[valid]
+        # Repeated indices only set the same bit again, so |= is safe here
+        flat_next[(sio[:, 0] * num_in + sio[:, 1]) * num_out + sio[:, 2]] |= 1 << bit
+    
+    io_per_state = num_in * num_out
+    flat_src = np.arange(flat_next.size, dtype=np.int64) // io_per_state
+    
+    # Bucket every combination by its (src, dst) edge in one pass
+    edge_keys = flat_src * num_states + flat_next
+    unique_keys, first_index, inverse, counts = np.unique(
+        edge_keys, return_index=True, return_inverse=True, return_counts=True)
+    members = np.argsort(inverse, kind='stable') % io_per_state
+    member_inputs = (members // num_out).tolist()
+    member_outputs = (members % num_out).tolist()
+    ends = np.cumsum(counts).tolist()
+    counts = counts.tolist()
+    unique_keys = unique_keys.tolist()
+    
+    trans_by_edge = defaultdict(list)  # (state, next_state) -> [(input, output)]
+    for u in np.argsort(first_index, kind='stable').tolist():
+        start = ends[u] - counts[u]
+        trans_by_edge[divmod(unique_keys[u], num_states)] = list(zip(
+            member_inputs[start:ends[u]], member_outputs[start:ends[u]]))
+    
+    return trans_by_edge
+
+
+def _explicit_transitions_reachable(trans_funcs, num_state_bits, num_inputs, num_outputs, initial_state):
+    """
+    Like _explicit_transitions_python, but only for states reachable from
+    initial_state: each state's row of next states is completed when the BFS
+    first reaches it, so unreachable parts of the state space are never
+    enumerated. Edges are still listed in state order.
+    """
+    num_states = 1 << num_state_bits
+    num_in = 1 << num_inputs
+    num_out = 1 << num_outputs
+    
+    # state -> [(input * num_out + output, bit weight)] from every minterm
+    contributions = defaultdict(list)
+    for bit, minterms in trans_funcs.items():
+        if not 0 <= bit < num_state_bits:
+            continue
+        weight = 1 << bit
+        for state, inp, out in minterms:
+            if 0 <= state < num_states and 0 <= inp < num_in and 0 <= out < num_out:
+                contributions[state].append((inp * num_out + out, weight))
+    
+    edges_by_state = {}  # state -> {(state, next_state): [(input, output)]}
+    queue = deque([initial_state])
+    edges_by_state[initial_state] = None
+    while queue:
+        state = queue.popleft()
+        row = [0] * (num_in * num_out)
+        for io_index, weight in contributions.get(state, ()):
+            row[io_index] |= weight
+        
+        edges = {}
+        for io_index, next_state in enumerate(row):
+            edges.setdefault((state, next_state), []).append(divmod(io_index, num_out))
+            if next_state not in edges_by_state:
+                edges_by_state[next_state] = None
+                queue.append(next_state)
+        edges_by_state[state] = edges
+    
+    trans_by_edge = defaultdict(list)  # (state, next_state) -> [(input, output)]
+    for state in sorted(edges_by_state):
+        trans_by_edge.update(edges_by_state[state])
+    
+    return trans_by_edge
+
+
+def build_explicit_dfa(dfa, reachable_only=False):
+    """
+    Build explicit DFA from BDD minterms.
+    With reachable_only, transitions are only built for states reachable
+    from the initial state.
+    """
     num_state_bits = dfa['num_state_bits']
     num_inputs = dfa['num_inputs']
     num_outputs = dfa['num_outputs']
@@ -147,27 +280,15 @@ def build_explicit_dfa(dfa):
         if m:
             accepting_states.add(minterm_to_int(m))
     
-    # Build lookup: for each bit, which (state, input, output) gives 1
-    trans_lookup = {}
-    for bit, minterms in dfa['trans_funcs'].items():
-        trans_lookup[bit] = set(minterms)
-    
-    # Build explicit transitions: (state, input, output) -> next_state
-    # Also group by (state, next_state) -> list of (input, output) values
-    transitions = {}  # (state, input, output) -> next_state
-    trans_by_edge = defaultdict(list)  # (state, next_state) -> [(input, output)]
-    
-    for state in range(num_states):
-        for inp in range(1 << num_inputs):
-            for out in range(1 << num_outputs):
-                # Compute next state by checking each bit
-                next_state = 0
-                for bit in range(num_state_bits):
-                    if bit in trans_lookup and (state, inp, out) in trans_lookup[bit]:
-                        next_state |= (1 << bit)
-                
-                transitions[(state, inp, out)] = next_state
-                trans_by_edge[(state, next_state)].append((inp, out))
+    if reachable_only:
+        trans_by_edge = _explicit_transitions_reachable(
+            dfa['trans_funcs'], num_state_bits, num_inputs, num_outputs, initial_state)
+    elif HAS_NUMPY:
+        trans_by_edge = _explicit_transitions_numpy(
+            dfa['trans_funcs'], num_state_bits, num_inputs, num_outputs)
+    else:
+        trans_by_edge = _explicit_transitions_python(
+            dfa['trans_funcs'], num_state_bits, num_inputs, num_outputs)
     
     return {
         'num_states': num_states,
@@ -176,112 +297,240 @@ def build_explicit_dfa(dfa):
         'num_outputs': num_outputs,
         'initial_state': initial_state,
         'accepting_states': accepting_states,
-        'transitions': transitions,
         'trans_by_edge': trans_by_edge,
         'input_labels': dfa['input_labels'],
         'output_labels': dfa['output_labels']
     }
 
 
+def _prime_implicants(minterms, num_vars):
+    """
+    Quine-McCluskey: merge cubes differing in one cared-for bit until nothing
+    merges. A cube is (value, mask) where mask bits are don't-cares.
+    """
+    cubes = {(m, 0) for m in minterms}
+    primes = set()
+    while cubes:
+        merged = set()
+        used = set()
+        for value, mask in cubes:
+            for i in range(num_vars):
+                bit = 1 << i
+                if mask & bit or value & bit:
+                    continue
+                partner = (value | bit, mask)
+                if partner in cubes:
+                    merged.add((value, mask | bit))
+                    used.add((value, mask))
+                    used.add(partner)
+        primes |= cubes - used
+        cubes = merged
+    return primes
+
+
+def _select_cover(primes, minterms):
+    """Pick essential prime implicants, then greedily cover what is left."""
+    covers = {p: {m for m in minterms if m & ~p[1] == p[0]} for p in primes}
+    chosen = []
+    uncovered = set(minterms)
+    for m in minterms:
+        covering = [p for p in primes if m in covers[p]]
+        if len(covering) == 1 and covering[0] not in chosen:
+            chosen.append(covering[0])
+            uncovered -= covers[covering[0]]
+    while uncovered:
+        # Most newly covered minterms first, then fewest literals
+        best = max(primes, key=lambda p: (len(covers[p] & uncovered), bin(p[1]).count('1'), -p[0], -p[1]))
+        chosen.append(best)
+        uncovered -= covers[best]
+    return chosen
+
+
+# (frozenset of (input, output) pairs, num_inputs, num_outputs,
+#  input labels, output labels) -> minimized label
+LABEL_CACHE = {}
+
+
+def _sop_terms(minterms, num_vars):
+    """Minimal cover as sorted lists of (variable index, negated) literals."""
+    minterms = sorted(minterms)
+    cover = _select_cover(_prime_implicants(minterms, num_vars), minterms)
+    terms = []
+    for value, mask in cover:
+        terms.append([(i, not (value >> i) & 1) for i in range(num_vars) if not (mask >> i) & 1])
+    terms.sort()
+    return terms
+
+
 def minimize_label(io_pairs, num_inputs, num_outputs, input_labels, output_labels):
-    """Minimize transition label using sympy."""
+    """Minimize transition label to a sum of products (Quine-McCluskey)."""
+    # Many edges share the same (input, output) set, so the result is cached
+    key = (
+        frozenset(io_pairs),
+        num_inputs,
+        num_outputs,
+        tuple(input_labels or ()),
+        tuple(output_labels or ())
+    )
+    label = LABEL_CACHE.get(key)
+    if label is None:
+        label = LABEL_CACHE[key] = _minimize_label_uncached(*key)
+    return label
+
+
+def _minimize_one(key):
+    """Pool worker: minimize one LABEL_CACHE key."""
+    return _minimize_label_uncached(*key)
+
+
+# Fewer distinct labels than this are minimized in-process: starting
+# worker processes would cost more than the minimization itself
+PARALLEL_LABEL_THRESHOLD = 64
+
+
+def precompute_labels(edges, num_inputs, num_outputs, input_labels, output_labels, jobs):
+    """
+    Fill LABEL_CACHE for the io_pairs lists in edges, spreading the distinct
+    uncached labels over a process pool of `jobs` workers.
+    """
+    if jobs <= 1:
+        return
+    label_tuple = (tuple(input_labels or ()), tuple(output_labels or ()))
+    keys = {(frozenset(io_pairs), num_inputs, num_outputs) + label_tuple for io_pairs in edges}
+    missing = [key for key in keys if key not in LABEL_CACHE]
+    if len(missing) < PARALLEL_LABEL_THRESHOLD:
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        LABEL_CACHE.update(zip(missing, pool.map(_minimize_one, missing, chunksize=32)))
+
+
+def _minimize_label_uncached(io_pairs, num_inputs, num_outputs, input_labels, output_labels):
     num_io = num_inputs + num_outputs
     all_io = 1 << num_io
     
     # If all I/O values lead to same transition, return "true"
     if len(io_pairs) == all_io:
         return 'true'
+    if not io_pairs:
+        return 'false'
     
     # Build label names
-    in_labels = list(input_labels) if input_labels else [f'i{i}' for i in range(num_inputs)]
-    out_labels = list(output_labels) if output_labels else [f'o{i}' for i in range(num_outputs)]
-    all_labels = in_labels + out_labels
-    
-    if not HAS_SYMPY:
-        # Just return first pair as example
-        if io_pairs:
-            inp, out = io_pairs[0]
-            parts = []
-            for i in range(num_inputs):
-                label = in_labels[i] if i < len(in_labels) else f'i{i}'
-                if (inp >> i) & 1:
-                    parts.append(label)
-                else:
-                    parts.append(f'!{label}')
-            for i in range(num_outputs):
-                label = out_labels[i] if i < len(out_labels) else f'o{i}'
-                if (out >> i) & 1:
-                    parts.append(label)
-                else:
-                    parts.append(f'!{label}')
-            if len(io_pairs) > 1:
-                return f"({' & '.join(parts)}) | ..."
-            return ' & '.join(parts)
-        return 'true'
-    
-    # Create symbols
-    syms = symbols(all_labels[:num_io])
-    
-    # Build minterms list for SOPform
-    minterms = []
-    for inp, out in io_pairs:
-        io_val = inp | (out << num_inputs)
-        minterm = tuple((io_val >> i) & 1 for i in range(num_io))
-        minterms.append(minterm)
-    
-    try:
-        expr = SOPform(syms, minterms)
-        result = str(expr)
-        # Clean up sympy output
-        result = result.replace('~', '!')
-        result = result.replace(' & ', ' ∧ ')
-        result = result.replace(' | ', ' ∨ ')
-        return result
-    except:
-        return f'{len(io_pairs)} conditions'
-
-
-def compute_sccs(explicit_dfa, reachable):
-    """Compute SCCs using Tarjan's algorithm."""
-    graph = defaultdict(set)
-    for (src, dst), _ in explicit_dfa['trans_by_edge'].items():
-        if src in reachable and dst in reachable:
-            graph[src].add(dst)
-    
-    index_counter = [0]
+    in_labels = list(input_labels) if input_labels else []
+    out_labels = list(output_labels) if output_labels else []
+    names = [in_labels[i] if i < len(in_labels) else f'i{i}' for i in range(num_inputs)]
+    names += [out_labels[i] if i < len(out_labels) else f'o{i}' for i in range(num_outputs)]
+    
+    values = [inp | (out << num_inputs) for inp, out in io_pairs]
+    all_ones = functools.reduce(operator.and_, values)
+    varying = functools.reduce(operator.or_, values) ^ all_ones
+    inputs = {inp for inp, _ in io_pairs}
+    outputs = {out for _, out in io_pairs}
+    if len(values) == 1 << bin(varying).count('1'):
+        # The pairs fill the sub-cube spanned by the varying bits (a single
+        # pair included): the label is one conjunction of the fixed bits
+        terms = [[(i, not (all_ones >> i) & 1) for i in range(num_io) if not (varying >> i) & 1]]
+    elif len(io_pairs) == len(inputs) << num_outputs:
+        # Every output for each input: outputs are don't-cares, minimize the input guard
+        terms = _sop_terms(inputs, num_inputs)
+    elif len(io_pairs) == len(outputs) << num_inputs:
+        # Every input for each output: minimize the output guard alone
+        terms = [[(i + num_inputs, negated) for i, negated in literals]
+                 for literals in _sop_terms(outputs, num_outputs)]
+    else:
+        terms = _sop_terms(values, num_io)
+    
+    products = []
+    for literals in terms:
+        product = ' ∧ '.join(f'!{names[i]}' if negated else names[i] for i, negated in literals)
+        if len(literals) > 1 and len(terms) > 1:
+            product = f'({product})'
+        products.append(product)
+    return ' ∨ '.join(products)
+
+
+def successor_map(explicit_dfa):
+    """State -> set of successor states, built once from trans_by_edge."""
+    succ = defaultdict(set)
+    for src, dst in explicit_dfa['trans_by_edge']:
+        succ[src].add(dst)
+    return succ
+
+
+def reachable_states(explicit_dfa, succ):
+    """States reachable from the initial state (BFS)."""
+    initial = explicit_dfa['initial_state']
+    reachable = {initial}
+    queue = deque([initial])
+    while queue:
+        v = queue.popleft()
+        for w in succ.get(v, ()):
+            if w not in reachable:
+                reachable.add(w)
+                queue.append(w)
+    return reachable
+
+
+def compute_sccs(explicit_dfa, reachable, succ=None):
+    """
+    Compute SCCs using Tarjan's algorithm.
+    succ may be passed from successor_map when reachable is closed under it.
+    """
+    if succ is not None:
+        graph = succ
+    else:
+        graph = defaultdict(set)
+        for (src, dst), _ in explicit_dfa['trans_by_edge'].items():
+            if src in reachable and dst in reachable:
+                graph[src].add(dst)
+    
+    # Flat per-state tables; index -1 marks an unvisited state
+    num_states = explicit_dfa['num_states']
+    index = [-1] * num_states
+    lowlinks = [0] * num_states
+    on_stack = [False] * num_states
+    counter = 0
     stack = []
-    lowlinks = {}
-    index = {}
-    on_stack = {}
     sccs = []
     
-    def strongconnect(v):
-        index[v] = index_counter[0]
-        lowlinks[v] = index_counter[0]
-        index_counter[0] += 1
-        stack.append(v)
-        on_stack[v] = True
-        
-        for w in graph.get(v, []):
-            if w not in index:
-                strongconnect(w)
-                lowlinks[v] = min(lowlinks[v], lowlinks[w])
-            elif on_stack.get(w, False):
-                lowlinks[v] = min(lowlinks[v], index[w])
+    # Iterative Tarjan: each work entry is (node, iterator over successors)
+    for root in reachable:
+        if index[root] != -1:
+            continue
+        index[root] = lowlinks[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(graph.get(root, ())))]
         
-        if lowlinks[v] == index[v]:
-            scc = []
-            while True:
-                w = stack.pop()
-                on_stack[w] = False
-                scc.append(w)
-                if w == v:
+        while work:
+            v, successors = work[-1]
+            for w in successors:
+                if index[w] == -1:
+                    index[w] = lowlinks[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(graph.get(w, ()))))
                     break
-            sccs.append(set(scc))
-    
-    for v in reachable:
-        if v not in index:
-            strongconnect(v)
+                elif on_stack[w] and index[w] < lowlinks[v]:
+                    lowlinks[v] = index[w]
+            else:
+                # All successors done: emit the SCC if v is its root
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlinks[v] < lowlinks[parent]:
+                        lowlinks[parent] = lowlinks[v]
+                if lowlinks[v] == index[v]:
+                    scc = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        scc.append(w)
+                        if w == v:
+                            break
+                    sccs.append(set(scc))
     
     return sccs
 
@@ -311,38 +560,23 @@ def check_weak_dfa(explicit_dfa, sccs):
     return len(problematic) == 0, problematic
 
 
-def generate_graphviz(explicit_dfa, all_states=False):
-    """Generate Graphviz DOT representation."""
-    lines = []
-    lines.append('digraph DFA {')
-    lines.append('    rankdir=LR;')
-    lines.append('    node [shape=circle, fontname="monospace"];')
-    lines.append('    edge [fontname="monospace", fontsize=10];')
-    lines.append('')
+class HashingWriter:
+    """File-like wrapper that hashes all text written through it."""
     
-    # Initial state marker
-    lines.append('    __start [shape=none, label=""];')
-    lines.append(f'    __start -> {explicit_dfa["initial_state"]};')
-    lines.append('')
+    def __init__(self, out, salt=''):
+        self.out = out
+        self.digest = hashlib.blake2b(salt.encode('utf-8'), digest_size=16)
     
-    # Determine reachable states
-    if all_states:
-        reachable = set(range(explicit_dfa['num_states']))
-    else:
-        reachable = set()
-        reachable.add(explicit_dfa['initial_state'])
-        changed = True
-        while changed:
-            changed = False
-            for (src, dst), _ in explicit_dfa['trans_by_edge'].items():
-                if src in reachable and dst not in reachable:
-                    reachable.add(dst)
-                    changed = True
+    def write(self, text):
+        self.digest.update(text.encode('utf-8'))
+        return self.out.write(text)
     
-    # Compute SCCs and assign colors
-    sccs = compute_sccs(explicit_dfa, reachable)
-    
-    # Check if DFA is weak
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+
+def report_weakness(explicit_dfa, sccs):
+    """Print a warning with the mixed SCCs to stderr if the DFA is not weak."""
     is_weak, problematic_sccs = check_weak_dfa(explicit_dfa, sccs)
     if not is_weak:
         print("=" * 60, file=sys.stderr)
@@ -353,6 +587,49 @@ def generate_graphviz(explicit_dfa, all_states=False):
             print(f"    Accepting states: {sorted(p['accepting'])}", file=sys.stderr)
             print(f"    Rejecting states: {sorted(p['rejecting'])}", file=sys.stderr)
         print("=" * 60, file=sys.stderr)
+    return is_weak
+
+
+def dot_escape(text):
+    """Escape text for a double-quoted DOT string."""
+    # Chained replace: str.translate is far slower on the non-ASCII labels
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def generate_graphviz(explicit_dfa, all_states=False, out=None, jobs=1):
+    """
+    Generate Graphviz DOT representation.
+    Written to the file-like out as it is produced; returned as a string
+    when out is None. With jobs > 1, labels are minimized in parallel.
+    """
+    if out is None:
+        buf = io.StringIO()
+        generate_graphviz(explicit_dfa, all_states, buf, jobs)
+        return buf.getvalue().rstrip('\n')
+    write = out.write
+    write('digraph DFA {\n')
+    write('    rankdir=LR;\n')
+    write('    node [shape=circle, fontname="monospace"];\n')
+    write('    edge [fontname="monospace", fontsize=10];\n')
+    write('\n')
+    
+    # Initial state marker
+    write('    __start [shape=none, label=""];\n')
+    write(f'    __start -> {explicit_dfa["initial_state"]};\n')
+    write('\n')
+    
+    # Determine reachable states
+    succ = successor_map(explicit_dfa)
+    if all_states:
+        reachable = set(range(explicit_dfa['num_states']))
+    else:
+        reachable = reachable_states(explicit_dfa, succ)
+    
+    # Compute SCCs and assign colors
+    sccs = compute_sccs(explicit_dfa, reachable, succ)
+    
+    # Check if DFA is weak
+    report_weakness(explicit_dfa, sccs)
     
     scc_colors = [
         '#FFB3BA', '#BAFFC9', '#BAE1FF', '#FFFFBA', '#FFDFba',
@@ -365,44 +642,88 @@ def generate_graphviz(explicit_dfa, all_states=False):
             state_to_scc_color[s] = color
     
     # Node definitions
+    accepting = explicit_dfa['accepting_states']
     for s in range(explicit_dfa['num_states']):
         if s not in reachable:
             continue
         
-        shape = 'doublecircle' if s in explicit_dfa['accepting_states'] else 'circle'
-        border_color = 'green' if s in explicit_dfa['accepting_states'] else 'black'
+        shape = 'doublecircle' if s in accepting else 'circle'
+        border_color = 'green' if s in accepting else 'black'
         fill_color = state_to_scc_color.get(s, 'white')
-        lines.append(f'    {s} [shape={shape}, color={border_color}, style=filled, fillcolor="{fill_color}", label="{s}"];')
+        write(f'    {s} [shape={shape}, color={border_color}, style=filled, fillcolor="{fill_color}", label="{s}"];\n')
     
-    lines.append('')
+    write('\n')
     
     # Transitions with minimized labels
+    precompute_labels(
+        [io_pairs for (src, _), io_pairs in explicit_dfa['trans_by_edge'].items() if src in reachable],
+        explicit_dfa['num_inputs'],
+        explicit_dfa['num_outputs'],
+        explicit_dfa['input_labels'],
+        explicit_dfa['output_labels'],
+        jobs
+    )
+    label_args = (
+        explicit_dfa['num_inputs'],
+        explicit_dfa['num_outputs'],
+        tuple(explicit_dfa['input_labels'] or ()),
+        tuple(explicit_dfa['output_labels'] or ())
+    )
     for (src, dst), io_pairs in explicit_dfa['trans_by_edge'].items():
         if src not in reachable:
             continue
-        
-        label = minimize_label(
-            io_pairs,
-            explicit_dfa['num_inputs'],
-            explicit_dfa['num_outputs'],
-            explicit_dfa['input_labels'],
-            explicit_dfa['output_labels']
-        )
-        
-        # Escape for DOT
-        label = label.replace('"', '\\"')
-        lines.append(f'    {src} -> {dst} [label="{label}"];')
-    
-    lines.append('}')
+        label = dot_escape(minimize_label(io_pairs, *label_args))
+        write(f'    {src} -> {dst} [label="{label}"];\n')
     
-    return '\n'.join(lines)
+    write('}\n')
+
+
+CACHE_VERSION = 1
+# Same location as mode_table.py --cache
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'lydia')
+
+
+def cache_file(cache_dir, content, is_json, all_states):
+    """Cache file for this input text and the options that change the result."""
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16)
+    digest.update(f'|v{CACHE_VERSION}|json={bool(is_json)}|all={bool(all_states)}'.encode())
+    return os.path.join(cache_dir, f'dfa-{digest.hexdigest()}.pkl')
+
+
+def load_cache(path):
+    """Return (explicit_dfa, labels) from a cache file, or None if it is missing or unusable."""
+    try:
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+    except Exception:
+        # stale or foreign pickles fail in many ways (AttributeError, ImportError, ...)
+        return None
+    if (isinstance(cached, tuple) and len(cached) == 2
+            and isinstance(cached[0], dict) and isinstance(cached[1], dict)):
+        return cached
+    return None
+
+
+def save_cache(path, explicit_dfa, labels):
+    """Write (explicit_dfa, labels) atomically; failures only cost the cache."""
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump((explicit_dfa, labels), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not write cache {path}: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
 
 
 def main():
     import argparse
     import subprocess
     import tempfile
-    import os
     
     parser = argparse.ArgumentParser(description='Visualize DFA from solver output')
     parser.add_argument('input', nargs='?', help='Input file (.json or text with PYDFA dump, default: stdin)')
@@ -410,7 +731,15 @@ def main():
     parser.add_argument('--dot-only', action='store_true', help='Only output DOT to stdout, no PNG')
     parser.add_argument('--all-states', action='store_true', help='Show all states, not just reachable ones')
     parser.add_argument('--json', action='store_true', help='Force JSON parsing (auto-detected by .json extension)')
+    parser.add_argument('--max-states', type=int, default=500, metavar='N',
+                        help='Refuse to render a PNG with more than N shown states; dot is very slow or crashes on large graphs (0: no limit, default: 500)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for label minimization on large DFAs; 0 uses the CPU count '
+                             '(default: 1, no process pool)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None, metavar='DIR',
+                        help=f'Reuse the built DFA and minimized labels for unchanged input (default DIR: {DEFAULT_CACHE_DIR})')
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
     
     # Determine input format
     is_json = args.json or (args.input and args.input.endswith('.json'))
@@ -418,32 +747,38 @@ def main():
     # Read input
     if args.input:
         with open(args.input, 'r') as f:
-            if is_json:
-                content = f.read()
-                dfa = parse_json_dfa(content)
-            else:
-                lines = f.readlines()
-                dfa = parse_dfa_dump(lines)
+            content = f.read()
+    else:
+        content = sys.stdin.read()
+    
+    cache_path = None
+    cached = None
+    if args.cache:
+        cache_path = cache_file(args.cache, content, is_json, args.all_states)
+        cached = load_cache(cache_path)
+    
+    if cached is not None:
+        explicit_dfa, labels = cached
+        LABEL_CACHE.update(labels)
     else:
-        lines = sys.stdin.readlines()
-        # Try JSON first, fall back to text format
         if is_json:
-            content = ''.join(lines)
             try:
                 dfa = parse_json_dfa(content)
             except json.JSONDecodeError:
+                if args.input:
+                    raise
                 print("Error: Invalid JSON input", file=sys.stderr)
                 return 1
         else:
-            dfa = parse_dfa_dump(lines)
-    
-    if dfa['num_state_bits'] == 0:
-        print("Error: No DFA dump found in input", file=sys.stderr)
-        print("Make sure the input contains ===PYDFA_BEGIN=== ... ===PYDFA_END=== or valid JSON", file=sys.stderr)
-        return 1
-    
-    # Build explicit DFA
-    explicit_dfa = build_explicit_dfa(dfa)
+            dfa = parse_dfa_dump(content.splitlines())
+        
+        if dfa['num_state_bits'] == 0:
+            print("Error: No DFA dump found in input", file=sys.stderr)
+            print("Make sure the input contains ===PYDFA_BEGIN=== ... ===PYDFA_END=== or valid JSON", file=sys.stderr)
+            return 1
+        
+        # Build explicit DFA
+        explicit_dfa = build_explicit_dfa(dfa, reachable_only=not args.all_states)
     
     # Print some info to stderr
     print(f"Parsed DFA:", file=sys.stderr)
@@ -453,34 +788,86 @@ def main():
     print(f"  Outputs: {explicit_dfa['output_labels']}", file=sys.stderr)
     print(f"  Initial state: {explicit_dfa['initial_state']}", file=sys.stderr)
     print(f"  Accepting states: {explicit_dfa['accepting_states']}", file=sys.stderr)
-    print(f"  Edges: {len(explicit_dfa['trans_by_edge'])}", file=sys.stderr)
+    edges_scope = '' if args.all_states else ' (from reachable states)'
+    print(f"  Edges{edges_scope}: {len(explicit_dfa['trans_by_edge'])}", file=sys.stderr)
     
-    # Generate DOT
-    dot = generate_graphviz(explicit_dfa, all_states=args.all_states)
+    def write_dot(out):
+        generate_graphviz(explicit_dfa, all_states=args.all_states, out=out, jobs=jobs)
+        if cache_path and cached is None:
+            save_cache(cache_path, explicit_dfa, LABEL_CACHE)
     
     if args.dot_only:
-        print(dot)
+        write_dot(sys.stdout)
         return 0
     
-    # Generate PNG
+    # Generate PNG, streaming the DOT straight into dot's stdin
     output_file = args.output or 'dfa.png'
     
+    succ = successor_map(explicit_dfa)
+    if args.all_states:
+        shown = set(range(explicit_dfa['num_states']))
+    else:
+        shown = reachable_states(explicit_dfa, succ)
+    if args.max_states and len(shown) > args.max_states:
+        # Still report weakness: callers look for the warning on stderr
+        report_weakness(explicit_dfa, compute_sccs(explicit_dfa, shown, succ))
+        print(f"Error: {len(shown)} states to draw exceeds --max-states {args.max_states}; "
+              f"Graphviz layout is impractical at this size.", file=sys.stderr)
+        print("Use --dot-only to get the DOT text, or raise --max-states.", file=sys.stderr)
+        return 1
+    
+    # The PNG is reused when it was rendered from this same DOT text; the
+    # digest is kept next to it
+    dot_format = '-Tpng'
+    hash_file = output_file + '.dothash'
+    pending_dot = None
+    if os.path.exists(output_file) and os.path.exists(hash_file):
+        hasher = HashingWriter(io.StringIO(), dot_format)
+        write_dot(hasher)
+        try:
+            with open(hash_file) as f:
+                up_to_date = f.read().strip() == hasher.hexdigest()
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            print(f"Up to date: {output_file}", file=sys.stderr)
+            return 0
+        pending_dot = hasher.out.getvalue()
+    
     try:
-        
-        result = subprocess.run(
-            ['dot', '-Tpng', '-o', output_file],
-            input=dot,
-            text=True,
-            capture_output=True
-        )
-        if result.returncode != 0:
-            print(f"Error running dot: {result.stderr}", file=sys.stderr)
-            return 1
+        with tempfile.TemporaryFile(mode='w+') as dot_stderr:
+            proc = subprocess.Popen(
+                ['dot', dot_format, '-o', output_file],
+                stdin=subprocess.PIPE,
+                stderr=dot_stderr,
+                text=True
+            )
+            hasher = HashingWriter(proc.stdin, dot_format)
+            try:
+                if pending_dot is not None:
+                    hasher.write(pending_dot)
+                else:
+                    write_dot(hasher)
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = proc.wait()
+            if returncode != 0:
+                dot_stderr.seek(0)
+                print(f"Error running dot: {dot_stderr.read()}", file=sys.stderr)
+                if os.path.exists(hash_file):
+                    os.remove(hash_file)
+                return 1
+        try:
+            with open(hash_file, 'w') as f:
+                f.write(hasher.hexdigest() + '\n')
+        except OSError as e:
+            print(f"Warning: could not write {hash_file}: {e}", file=sys.stderr)
         print(f"Generated: {output_file}", file=sys.stderr)
     except FileNotFoundError:
         print("Error: 'dot' command not found. Install graphviz.", file=sys.stderr)
         print("Falling back to DOT output:", file=sys.stderr)
-        print(dot)
+        write_dot(sys.stdout)
         return 1
     
     return 0
@@ -42,28 +42,34 @@ def parse_trace(lines):
     good_after = set()
     bad_after = set()
 
+    # Substring checks first: most lines match none of the patterns, and
+    # `in` is far cheaper than a regex search
     for line in lines:
-        m = LAYER_PAT.search(line)
-        if m:
-            current_layer = int(m.group(1))
+        if "Processing layer" in line:
+            m = LAYER_PAT.search(line)
+            if m:
+                current_layer = int(m.group(1))
         if current_layer is not None and "input_labels" in line:
             # capture input/output labels if present
-            if "input_labels" in line:
-                layer_inputs[current_layer] = line.strip()
+            layer_inputs[current_layer] = line.strip()
+        if "->" in line:
+            m = TRANS_PAT.search(line)
+            if m:
+                transitions.add((int(m.group(1)), int(m.group(2))))
+        if "[DEBUG]" not in line:
+            continue
         m = SET_PAT.search(line)
         if m and current_layer is not None:
             name = m.group(1).strip()
             states = parse_states_list(m.group(2))
             layers[current_layer][name] = states
-        m = TRANS_PAT.search(line)
-        if m:
-            transitions.add((int(m.group(1)), int(m.group(2))))
-        m = GOOD_AFTER_PAT.search(line)
-        if m:
-            good_after = parse_states_list(m.group(1))
-        m = BAD_AFTER_PAT.search(line)
-        if m:
-            bad_after = parse_states_list(m.group(1))
+        if "(after)" in line:
+            m = GOOD_AFTER_PAT.search(line)
+            if m:
+                good_after = parse_states_list(m.group(1))
+            m = BAD_AFTER_PAT.search(line)
+            if m:
+                bad_after = parse_states_list(m.group(1))
     return layers, transitions, good_after, bad_after
 
 